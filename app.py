@@ -36,19 +36,28 @@ AVAILABILITY MANAGEMENT
 
 from flask import Flask, request, jsonify
 import logging
+import logging.handlers
+import atexit
 import json
 import os
+import sys
 from datetime import datetime, timedelta
 from dateutil import parser as date_parser
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail, Email, To, Content
 import psycopg2
-from psycopg2.extras import RealDictCursor, Json
+from psycopg2.extras import RealDictCursor, Json, execute_values
 from psycopg2.pool import SimpleConnectionPool
 from typing import List, Dict, Optional
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
+import io
 import re
-from urllib.parse import quote
+from urllib.parse import quote, urlencode
+from email.utils import parseaddr
+
+from prepared_statements import PooledConnection, execute_prepared
 
 app = Flask(__name__)
 
@@ -64,10 +73,37 @@ DEFAULT_COURSE_ID = os.getenv("DEFAULT_COURSE_ID", "royalportrush")
 TRACKING_EMAIL_PREFIX = os.getenv("TRACKING_EMAIL_PREFIX", "royalportrush")
 CLUB_BOOKING_EMAIL = os.getenv("CLUB_BOOKING_EMAIL", "teetimes@royalportrushgolfclub.com")
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+# Records are buffered and written in batches: at 64 records, on any ERROR,
+# at the end of each request (see flush_log_buffer), after each background
+# email send, and when the worker exits
+_log_target = logging.StreamHandler()
+_log_target.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+_log_buffer = logging.handlers.MemoryHandler(capacity=64, flushLevel=logging.ERROR, target=_log_target)
+logging.basicConfig(level=logging.INFO, handlers=[_log_buffer])
+atexit.register(_log_buffer.flush)
+
+# Log section separator
+_SEP = "=" * 60
 
 db_pool = None
 
+# Shared SendGrid client - reused across sends instead of built per email
+sg_client = SendGridAPIClient(SENDGRID_API_KEY) if SENDGRID_API_KEY else None
+
+# Webhook replies go out on background threads so the inbound webhook
+# responds as soon as the database work is done
+_MAIL_POOL = ThreadPoolExecutor(max_workers=4)
+
+# Interned result-dict keys used by the email row loops
+_K_DATE = sys.intern("date")
+_K_TIME = sys.intern("time")
+_K_GREEN_FEE = sys.intern("green_fee")
+_K_IS_GROUPED = sys.intern("is_grouped")
+_K_GROUPED_TIMES = sys.intern("grouped_times")
+_K_NUM_GROUPS = sys.intern("num_groups")
+_K_IS_MULTI_GROUP = sys.intern("_is_multi_group")
+_K_TIME_DISPLAY = sys.intern("_time_display")
+
 # Royal Portrush Brand Colors
 ROYAL_PORTRUSH_COLORS = {
     'navy_primary': '#081c3c',
@@ -88,11 +124,47 @@ ROYAL_PORTRUSH_COLORS = {
     'warning_bg': '#fef9f0',
 }
 
+# Inline styles repeated on every tee time row - built once at import
+_BURGUNDY = ROYAL_PORTRUSH_COLORS['burgundy']
+_NAVY = ROYAL_PORTRUSH_COLORS['navy_primary']
+_BUTTON_STYLE = f"background: linear-gradient(135deg, {_BURGUNDY} 0%, {_NAVY} 100%); color: #ffffff; padding: 10px 20px; text-decoration: none; border-radius: 6px; font-weight: 600; font-size: 13px; display: inline-block;"
+_DATE_HEADING_STYLE = f"color: {_BURGUNDY}; font-size: 18px; margin: 0 0 15px 0;"
+_TIME_CELL_STYLE = f"color: {_NAVY};"
+_FEE_CELL_STYLE = f"color: {_BURGUNDY}; font-weight: 700;"
+
 
 # ============================================================================
 # DATABASE FUNCTIONS
 # ============================================================================
 
+# Availability queries run for every inquiry; PREPAREd on first use per
+# connection (see execute_prepared) so Postgres parses and plans them once
+# instead of on every execute: name -> (parameter types, statement)
+_PREPARED_STATEMENTS = {
+    'rp_blocked_date': ("(text, date)", """
+        SELECT reason FROM blocked_dates
+        WHERE club = $1 AND date = $2
+    """),
+    'rp_available_slots': ("(text, date)", """
+        SELECT
+            id,
+            date,
+            tee_time,
+            max_players,
+            available_slots,
+            is_available,
+            green_fee,
+            notes
+        FROM tee_times
+        WHERE club = $1
+        AND date = $2
+        AND is_available = TRUE
+        AND available_slots > 0
+        ORDER BY tee_time ASC
+    """),
+}
+
+
 def init_db_pool():
     """Initialize database connection pool"""
     global db_pool
@@ -100,7 +172,8 @@ def init_db_pool():
         if not DATABASE_URL:
             logging.error("DATABASE_URL not set!")
             return False
-        db_pool = SimpleConnectionPool(minconn=1, maxconn=10, dsn=DATABASE_URL)
+        db_pool = SimpleConnectionPool(minconn=1, maxconn=10, dsn=DATABASE_URL,
+                                       connection_factory=PooledConnection)
         logging.info("Database connection pool created")
         return True
     except Exception as e:
@@ -158,9 +231,13 @@ def init_database():
                 club_name VARCHAR(255),
                 customer_confirmed_at TIMESTAMP,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_by VARCHAR(255)
             );
         """)
+        # Who last changed the status - written by availability_manager, added to
+        # tables created before it existed
+        cursor.execute("ALTER TABLE bookings ADD COLUMN IF NOT EXISTS updated_by VARCHAR(255);")
 
         # Tee times table - THIS IS THE KEY CHANGE
         cursor.execute("""
@@ -174,11 +251,14 @@ def init_database():
                 is_available BOOLEAN DEFAULT TRUE,
                 green_fee DECIMAL(10, 2),
                 notes TEXT,
+                version INTEGER NOT NULL DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 UNIQUE(club, date, time)
             );
         """)
+        # Row version for optimistic locking - added to tables created before it existed
+        cursor.execute("ALTER TABLE tee_times ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0;")
 
         # Blocked dates table
         cursor.execute("""
@@ -197,6 +277,14 @@ def init_database():
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_bookings_status ON bookings(status);")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_tee_times_date ON tee_times(date);")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_tee_times_club_date ON tee_times(club, date);")
+        # Covering partial index for the bookable-slot lookups - only open slots are
+        # indexed, in time order, with the listed columns, so they're answered by an
+        # index-only scan with no sort.
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tee_times_available_covering
+            ON tee_times(club, date, time) INCLUDE (id, max_players, available_slots, green_fee)
+            WHERE is_available;
+        """)
 
         conn.commit()
         cursor.close()
@@ -270,20 +358,23 @@ def find_grouped_tee_times(all_slots: List[Dict], players: int, max_gap_minutes:
             # If this combination can fit the group, add it
             if total_capacity >= players:
                 times = [s['time'] for s in combination]
+                time_display = ' & '.join(times)
                 num_groups = len(combination)
                 # Use green_fee from first slot (or default if not available)
                 green_fee = combination[0].get('green_fee', PER_PLAYER_FEE)
 
-                logging.info(f"   ✓ Found combination: {' & '.join(times)} = {total_capacity} slots ({num_groups} groups)")
+                logging.info(f"   ✓ Found combination: {time_display} = {total_capacity} slots ({num_groups} groups)")
 
                 grouped_results.append({
                     'date': date,
                     'time': times[0],  # Primary time
                     'grouped_times': times,  # All times in the group
+                    '_time_display': time_display,
                     'available_slots': total_capacity,
                     'green_fee': green_fee,
                     'num_groups': num_groups,
-                    'is_grouped': True
+                    'is_grouped': True,
+                    '_is_multi_group': num_groups > 1
                 })
 
             i += 1
@@ -327,10 +418,7 @@ def check_availability_db(dates: List[str], players: int, club: str = None) -> L
                 continue
 
             # Check if date is blocked
-            cursor.execute("""
-                SELECT reason FROM blocked_dates
-                WHERE club = %s AND date = %s
-            """, (club, date_str))
+            execute_prepared(cursor, 'rp_blocked_date', _PREPARED_STATEMENTS, (club, date_str))
 
             blocked = cursor.fetchone()
             if blocked:
@@ -345,23 +433,7 @@ def check_availability_db(dates: List[str], players: int, club: str = None) -> L
             # Query available tee times for specific date (date-based inventory)
             logging.info(f"🔎 QUERYING - tee_times for date = '{date_str}'")
 
-            cursor.execute("""
-                SELECT
-                    id,
-                    date,
-                    tee_time,
-                    max_players,
-                    available_slots,
-                    is_available,
-                    green_fee,
-                    notes
-                FROM tee_times
-                WHERE club = %s
-                AND date = %s
-                AND is_available = TRUE
-                AND available_slots > 0
-                ORDER BY tee_time ASC
-            """, (club, date_str))
+            execute_prepared(cursor, 'rp_available_slots', _PREPARED_STATEMENTS, (club, date_str))
 
             date_results = cursor.fetchall()
             slots_found = len(date_results)
@@ -393,7 +465,8 @@ def check_availability_db(dates: List[str], players: int, club: str = None) -> L
                         'available_slots': available_slots,
                         'max_players': slot['max_players'],
                         'green_fee': green_fee,
-                        'is_grouped': False
+                        'is_grouped': False,
+                        '_is_multi_group': False
                     })
 
         cursor.close()
@@ -471,6 +544,21 @@ def find_alternative_dates(requested_dates: List[str], players: int, club: str =
     return []
 
 
+# Column order for the booking INSERT - values are passed as a tuple in this order
+_BOOKING_COLS = (
+    "booking_id", "message_id", "timestamp", "guest_email", "dates", "date", "tee_time",
+    "players", "total", "status", "note", "club", "club_name",
+)
+_BOOKING_INSERT_SQL = f"""
+    INSERT INTO bookings ({', '.join(_BOOKING_COLS)})
+    VALUES ({', '.join(['%s'] * len(_BOOKING_COLS))})
+    ON CONFLICT (booking_id) DO UPDATE SET
+        status = EXCLUDED.status,
+        note = EXCLUDED.note,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
 def save_booking_to_db(booking_data: dict):
     """Save booking to PostgreSQL"""
     conn = None
@@ -494,34 +582,21 @@ def save_booking_to_db(booking_data: dict):
         logging.info(f"   Date: {booking_data.get('date')}, Time: {booking_data.get('tee_time')}")
         logging.info(f"   Players: {booking_data['players']}, Status: {booking_data['status']}")
 
-        cursor.execute("""
-            INSERT INTO bookings (
-                booking_id, message_id, timestamp, guest_email, dates, date, tee_time,
-                players, total, status, note, club, club_name
-            ) VALUES (
-                %(booking_id)s, %(message_id)s, %(timestamp)s, %(guest_email)s, %(dates)s,
-                %(date)s, %(tee_time)s, %(players)s, %(total)s, %(status)s, %(note)s,
-                %(club)s, %(club_name)s
-            )
-            ON CONFLICT (booking_id) DO UPDATE SET
-                status = EXCLUDED.status,
-                note = EXCLUDED.note,
-                updated_at = CURRENT_TIMESTAMP
-        """, {
-            'booking_id': booking_id,
-            'message_id': booking_data.get('message_id'),
-            'timestamp': booking_data['timestamp'],
-            'guest_email': booking_data['guest_email'],
-            'dates': Json(booking_data.get('dates', [])),
-            'date': booking_data.get('date'),
-            'tee_time': booking_data.get('tee_time'),
-            'players': booking_data['players'],
-            'total': booking_data['total'],
-            'status': booking_data['status'],
-            'note': booking_data.get('note'),
-            'club': booking_data.get('club'),
-            'club_name': booking_data.get('club_name')
-        })
+        cursor.execute(_BOOKING_INSERT_SQL, (
+            booking_id,
+            booking_data.get('message_id'),
+            booking_data['timestamp'],
+            booking_data['guest_email'],
+            Json(booking_data.get('dates', [])),
+            booking_data.get('date'),
+            booking_data.get('tee_time'),
+            booking_data['players'],
+            booking_data['total'],
+            booking_data['status'],
+            booking_data.get('note'),
+            booking_data.get('club'),
+            booking_data.get('club_name'),
+        ))
 
         conn.commit()
         cursor.close()
@@ -632,6 +707,10 @@ def update_booking_in_db(booking_id: str, updates: dict):
             release_db_connection(conn)
 
 
+# Lowercased start of every booking ID, for cheap substring pre-checks
+_BOOKING_PREFIX = "rp-"
+
+
 def extract_booking_id(text: str) -> Optional[str]:
     pattern = r'RP-\d{8}-[A-F0-9]{8}'
     match = re.search(pattern, text, re.IGNORECASE)
@@ -787,18 +866,19 @@ def get_email_footer():
     """
 
 
-def build_booking_link(date: str, time: str, players: int, guest_email: str, booking_id: str = None, grouped_times: List[str] = None, num_groups: int = None) -> str:
-    """Generate mailto link for Book Now button"""
+def build_booking_link(date: str, time: str, players: int, guest_email: str, booking_id: str = None, grouped_times: List[str] = None, num_groups: int = None, time_display: str = None) -> str:
+    """Generate mailto link for Book Now button (time_display: pre-joined grouped times)"""
     tracking_email = f"{TRACKING_EMAIL_PREFIX}@bookings.teemail.io"
 
     # Handle grouped times
     if grouped_times and len(grouped_times) > 1:
-        time_display = " & ".join(grouped_times)
-        subject = quote(f"GROUP BOOKING REQUEST - {date} at {time_display}")
+        if time_display is None:
+            time_display = " & ".join(grouped_times)
+        subject = f"GROUP BOOKING REQUEST - {date} at {time_display}"
         tee_times_text = f"I would like to book the following tee times as a group:"
         time_detail = f"- Tee Times: {time_display} ({num_groups} groups)"
     else:
-        subject = quote(f"BOOKING REQUEST - {date} at {time}")
+        subject = f"BOOKING REQUEST - {date} at {time}"
         tee_times_text = f"I would like to book the following tee time:"
         time_detail = f"- Time: {time}"
 
@@ -818,8 +898,8 @@ def build_booking_link(date: str, time: str, players: int, guest_email: str, boo
     if booking_id:
         body_lines.insert(3, f"- Booking ID: {booking_id}")
 
-    body = quote("\n".join(body_lines))
-    return f"mailto:{tracking_email}?subject={subject}&body={body}"
+    params = urlencode({"subject": subject, "body": "\n".join(body_lines)}, safe="/", quote_via=quote)
+    return f"mailto:{tracking_email}?{params}"
 
 
 def format_date_display(date_str: str) -> str:
@@ -873,14 +953,78 @@ def outlook_info_box(content: str, border_color: str = None, bg_color: str = Non
     """
 
 
+# Stand-ins for the guest's details in cached inquiry HTML - letters only, so
+# quote() leaves them as they are inside the Book Now links
+_GUEST_EMAIL_TOKEN = "RPGCGUESTEMAILTOKEN"
+_BOOKING_ID_TOKEN = "RPGCBOOKINGIDTOKEN"
+
+
 def format_inquiry_email(results: list, player_count: int, guest_email: str, booking_id: str = None) -> str:
     """Generate inquiry email with available tee times"""
-    html = get_email_header()
+    if not results:
+        # Nothing to show - skip the tee time template entirely
+        return format_no_availability_email(player_count, guest_email=guest_email, booking_id=booking_id)
+
+    rows = tuple(_inquiry_row_key(r) for r in results)
+    html = _render_inquiry_cached(rows, player_count, bool(booking_id))
+    # Links are percent-encoded a character at a time, so each token's
+    # (unchanged) encoding can be swapped for the encoded real value
+    html = html.replace(_GUEST_EMAIL_TOKEN, quote(str(guest_email), safe="/"))
+    if booking_id:
+        html = html.replace(_BOOKING_ID_TOKEN, quote(str(booking_id), safe="/"))
+    return html
+
+
+def _inquiry_row_key(result: Dict) -> tuple:
+    """
+    Reduce a result to a hashable row of every field _render_inquiry reads:
+    (date, time, is_multi_group, grouped_times, num_groups, time_display)
+    """
+    is_multi_group = result.get(_K_IS_MULTI_GROUP)
+    if is_multi_group is None:
+        # Results from check_availability_db() and find_grouped_tee_times() carry the flag already
+        is_multi_group = bool(result.get(_K_IS_GROUPED) and len(result.get(_K_GROUPED_TIMES, [])) > 1)
+
+    if is_multi_group:
+        return (result[_K_DATE], result[_K_TIME], True, tuple(result[_K_GROUPED_TIMES]),
+                result.get(_K_NUM_GROUPS, 1), result.get(_K_TIME_DISPLAY))
+    # Single rows only show date and time
+    return (result[_K_DATE], result[_K_TIME], False, None, 1, None)
+
+
+@lru_cache(maxsize=128)
+def _render_inquiry_cached(rows: tuple, player_count: int, has_booking_id: bool) -> str:
+    """Render an inquiry email from _inquiry_row_key rows, with tokens for the guest's details"""
+    # Keyed on the tee times and party size only, so guests asking about the
+    # same times share an entry - and no guest's details are kept in the cache
+    results = [
+        {
+            _K_DATE: date,
+            _K_TIME: time,
+            _K_IS_MULTI_GROUP: is_multi_group,
+            _K_GROUPED_TIMES: grouped_times,
+            _K_NUM_GROUPS: num_groups,
+            _K_TIME_DISPLAY: time_display,
+        }
+        for date, time, is_multi_group, grouped_times, num_groups, time_display in rows
+    ]
+    buf = io.StringIO()
+    _render_inquiry(buf, results, player_count, _GUEST_EMAIL_TOKEN,
+                    _BOOKING_ID_TOKEN if has_booking_id else None)
+    return buf.getvalue()
+
+
+def _render_inquiry(out: io.StringIO, results: list, player_count: int, guest_email: str, booking_id: str = None) -> None:
+    """Write the inquiry email HTML into out, piece by piece"""
+    out.write(get_email_header())
     
     # Get date range
-    dates_list = sorted(list(set([r["date"] for r in results])))
+    dates_list = sorted(list(set([r[_K_DATE] for r in results])))
+
+    # Total is the same on every row - format it once
+    total_fee_str = f"{player_count * PER_PLAYER_FEE:.2f}"
     
-    html += f"""
+    out.write(f"""
         <p style="color: {ROYAL_PORTRUSH_COLORS['text_dark']}; font-size: 16px; line-height: 1.8;">
             Thank you for your enquiry! We're delighted to share available tee times for your round at Royal Portrush.
         </p>
@@ -890,18 +1034,18 @@ def format_inquiry_email(results: list, player_count: int, guest_email: str, boo
             <p style="margin: 5px 0;"><strong>Party Size:</strong> {player_count} player(s)</p>
             <p style="margin: 5px 0;"><strong>Status:</strong> <span style="color: {ROYAL_PORTRUSH_COLORS['success_green']};">✓ Tee Times Available</span></p>
         </div>
-    """
+    """)
     
     for date in dates_list:
-        date_results = [r for r in results if r["date"] == date]
+        date_results = [r for r in results if r[_K_DATE] == date]
         if not date_results:
             continue
             
         formatted_date = format_date_display(date)
         
-        html += f"""
+        out.write(f"""
         <div style="margin: 30px 0;">
-            <h2 style="color: {ROYAL_PORTRUSH_COLORS['burgundy']}; font-size: 18px; margin: 0 0 15px 0;">
+            <h2 style="{_DATE_HEADING_STYLE}">
                 📅 {formatted_date}
             </h2>
             <table class="tee-table">
@@ -914,46 +1058,41 @@ def format_inquiry_email(results: list, player_count: int, guest_email: str, boo
                     </tr>
                 </thead>
                 <tbody>
-        """
+        """)
         
         for result in date_results:
-            time = result["time"]
-            green_fee = result.get("green_fee", PER_PLAYER_FEE)
+            time = result[_K_TIME]
 
             # Handle grouped tee times for larger parties
-            is_grouped = result.get("is_grouped", False)
-            grouped_times = result.get("grouped_times", [time])
-            num_groups = result.get("num_groups", 1)
-
-            if is_grouped and len(grouped_times) > 1:
+            if result[_K_IS_MULTI_GROUP]:
                 # Display grouped times
-                time_display = " & ".join(grouped_times)
+                grouped_times = result[_K_GROUPED_TIMES]
+                num_groups = result.get(_K_NUM_GROUPS, 1)
+                time_display = result.get(_K_TIME_DISPLAY) or " & ".join(grouped_times)
                 players_display = f"{player_count} players ({num_groups} groups)"
-                total_fee = player_count * PER_PLAYER_FEE
                 booking_link = build_booking_link(date, time, player_count, guest_email, booking_id,
-                                                  grouped_times=grouped_times, num_groups=num_groups)
+                                                  grouped_times=grouped_times, num_groups=num_groups,
+                                                  time_display=time_display)
             else:
                 # Display single time
                 time_display = time
                 players_display = f"{player_count} players"
-                total_fee = player_count * PER_PLAYER_FEE
                 booking_link = build_booking_link(date, time, player_count, guest_email, booking_id)
 
-            html += f"""
+            out.write(f"""
                 <tr>
-                    <td><strong style="color: {ROYAL_PORTRUSH_COLORS['navy_primary']};">{time_display}</strong></td>
+                    <td><strong style="{_TIME_CELL_STYLE}">{time_display}</strong></td>
                     <td>{players_display}</td>
-                    <td style="color: {ROYAL_PORTRUSH_COLORS['burgundy']}; font-weight: 700;">{CURRENCY_SYMBOL}{total_fee:.2f}</td>
+                    <td style="{_FEE_CELL_STYLE}">{CURRENCY_SYMBOL}{total_fee_str}</td>
                     <td style="text-align: center;">
-                        <a href="{booking_link}" style="background: linear-gradient(135deg, {ROYAL_PORTRUSH_COLORS['burgundy']} 0%, {ROYAL_PORTRUSH_COLORS['navy_primary']} 100%); color: #ffffff; padding: 10px 20px; text-decoration: none; border-radius: 6px; font-weight: 600; font-size: 13px; display: inline-block;">Book Now</a>
+                        <a href="{booking_link}" style="{_BUTTON_STYLE}">Book Now</a>
                     </td>
                 </tr>
-            """
+            """)
         
-        html += "</tbody></table></div>"
+        out.write("</tbody></table></div>")
     
-    html += get_email_footer()
-    return html
+    out.write(get_email_footer())
 
 
 def format_acknowledgment_email(booking_data: Dict) -> str:
@@ -1096,7 +1235,7 @@ def format_no_availability_email(player_count: int, dates: list = None, alternat
     """
 
     # If alternative dates found, show them
-    if alternative_results and len(alternative_results) > 0:
+    if alternative_results:
         html += f"""
         <div style="background: {ROYAL_PORTRUSH_COLORS['success_bg']}; border-left: 4px solid {ROYAL_PORTRUSH_COLORS['success_green']}; border-radius: 8px; padding: 20px; margin: 25px 0;">
             <h3 style="color: {ROYAL_PORTRUSH_COLORS['success_green']}; margin: 0 0 15px 0;">✨ Alternative Dates Available</h3>
@@ -1105,10 +1244,10 @@ def format_no_availability_email(player_count: int, dates: list = None, alternat
         """
 
         # Group alternatives by date
-        alt_dates_list = sorted(list(set([r["date"] for r in alternative_results])))
+        alt_dates_list = sorted(list(set([r[_K_DATE] for r in alternative_results])))
 
         for date in alt_dates_list:
-            date_results = [r for r in alternative_results if r["date"] == date]
+            date_results = [r for r in alternative_results if r[_K_DATE] == date]
             if not date_results:
                 continue
 
@@ -1116,7 +1255,7 @@ def format_no_availability_email(player_count: int, dates: list = None, alternat
 
             html += f"""
             <div style="margin: 30px 0;">
-                <h2 style="color: {ROYAL_PORTRUSH_COLORS['burgundy']}; font-size: 18px; margin: 0 0 15px 0;">
+                <h2 style="{_DATE_HEADING_STYLE}">
                     📅 {formatted_date}
                 </h2>
                 <table class="tee-table">
@@ -1132,17 +1271,17 @@ def format_no_availability_email(player_count: int, dates: list = None, alternat
             """
 
             for result in date_results[:8]:  # Limit to 8 times per date
-                time = result["time"]
-                green_fee = result.get("green_fee", PER_PLAYER_FEE)
+                time = result[_K_TIME]
+                green_fee = result.get(_K_GREEN_FEE, PER_PLAYER_FEE)
                 booking_link = build_booking_link(date, time, player_count, guest_email, booking_id) if guest_email else "#"
 
                 html += f"""
                     <tr>
-                        <td><strong style="color: {ROYAL_PORTRUSH_COLORS['navy_primary']};">{time}</strong></td>
+                        <td><strong style="{_TIME_CELL_STYLE}">{time}</strong></td>
                         <td>{player_count} players</td>
-                        <td style="color: {ROYAL_PORTRUSH_COLORS['burgundy']}; font-weight: 700;">{CURRENCY_SYMBOL}{green_fee:.2f}</td>
+                        <td style="{_FEE_CELL_STYLE}">{CURRENCY_SYMBOL}{green_fee:.2f}</td>
                         <td style="text-align: center;">
-                            <a href="{booking_link}" style="background: linear-gradient(135deg, {ROYAL_PORTRUSH_COLORS['burgundy']} 0%, {ROYAL_PORTRUSH_COLORS['navy_primary']} 100%); color: #ffffff; padding: 10px 20px; text-decoration: none; border-radius: 6px; font-weight: 600; font-size: 13px; display: inline-block;">Book Now</a>
+                            <a href="{booking_link}" style="{_BUTTON_STYLE}">Book Now</a>
                         </td>
                     </tr>
                 """
@@ -1178,88 +1317,202 @@ def format_no_availability_email(player_count: int, dates: list = None, alternat
 def send_email_sendgrid(to_email: str, subject: str, html_body: str) -> bool:
     """Send email via SendGrid"""
     try:
-        logging.info(f"Sending email to: {to_email}")
+        logging.info("Sending email to: %s", to_email)
         message = Mail(
             from_email=Email(FROM_EMAIL, FROM_NAME),
             to_emails=To(to_email),
             subject=subject,
             html_content=Content("text/html", html_body)
         )
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
-        logging.info(f"Email sent - Status: {response.status_code}")
+        if not sg_client:
+            logging.error("SENDGRID_API_KEY not set!")
+            return False
+        response = sg_client.send(message)
+        logging.info("Email sent - Status: %s", response.status_code)
         return True
     except Exception as e:
-        logging.error(f"Failed to send email: {e}")
+        logging.error("Failed to send email: %s", e)
         return False
 
 
+def send_email_background(to_email: str, subject: str, html_body: str) -> bool:
+    """send_email_sendgrid for _MAIL_POOL threads, which no request teardown flushes"""
+    try:
+        return send_email_sendgrid(to_email, subject, html_body)
+    finally:
+        _log_buffer.flush()
+
+
 # ============================================================================
 # EMAIL DETECTION
 # ============================================================================
 
-def is_booking_request(subject: str, body: str) -> bool:
-    subject_lower = subject.lower() if subject else ""
-    body_lower = body.lower() if body else ""
-    
+# Parsing patterns - compiled once at import rather than on every email.
+# All player patterns are fused into one alternation so the text is
+# scanned once. Each alternative sits in a lookahead so a match never
+# consumes text another pattern needs; the first hit per group is then
+# ranked by _PLAYER_GROUPS priority, exactly as the old pattern loop did.
+_PLAYER_COMBINED = re.compile(
+    r'(?<!\d)(?=(?P<np>\d+)\s*(?:players?|people|persons?|golfers?|guests?))'  # "4 players", "2 people"
+    r'|(?=(?:party|group)\s+of\s+(?P<ng>\d+))'                        # "party of 4", "group of 6"
+    r'|(?<!\d)(?=(?P<ball>\d+)[-\s]ball)'                               # "4-ball", "2 ball"
+    r'|(?=(?P<foursome>foursome|four\s*ball))'                          # "foursome" = 4
+    r'|(?=(?P<twosome>twosome|two\s*ball))'                             # "twosome" = 2
+    r'|(?=for\s+(?P<fornum>\d+))'                                       # "booking for 4"
+    r'|(?=we\s+(?:are|have)\s+(?P<we>\d+))'                             # "we are 6", "we have 4"
+)
+
+# (group name, fixed player count) in priority order
+_PLAYER_GROUPS = [
+    ('np', None),
+    ('ng', None),
+    ('ball', None),
+    ('foursome', 4),
+    ('twosome', 2),
+    ('fornum', None),
+    ('we', None),
+]
+
+# All date formats fused into one alternation, scanned once. As with the
+# player patterns each alternative is a lookahead, so formats that overlap
+# (e.g. "4 December" inside "4 December 25 2026") are all still found;
+# the parse loop skips repeat hits of a format inside its previous match.
+# Where two formats match at the same position only the first is kept,
+# which drops the year-less duplicate of "25 December 2027".
+_DATE_COMBINED = re.compile(
+    # ISO format: 2025-12-25
+    r'(?=(?P<iso>\d{4}-\d{2}-\d{2}))'
+
+    # DD/MM/YYYY variants: 25/12/2025, 25-12-2025, 25.12.2025
+    r'|(?=(?P<dmy_full>\d{1,2}[/\-.]\d{1,2}[/\-.]\d{4}))'
+
+    # DD/MM/YY variants: 25/12/25
+    r'|(?=(?P<dmy_short>\d{1,2}[/\-.]\d{1,2}[/\-.]\d{2})(?!\d))'
+
+    # Month name formats: December 25 2025, Dec 25, 25 December 2025, 25th Dec 2025
+    r'|(?=(?P<dmy_named_year>\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{4}))'
+    r'|(?=(?P<mdy_named_year>(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2}(?:st|nd|rd|th)?(?:\s*,\s+|\s+)\d{4}))'
+    r'|(?=(?P<dmy_named>\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*))'
+    r'|(?=(?P<mdy_named>(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2}(?:st|nd|rd|th)?))'
+)
+
+_DATE_SEP_RE = re.compile(r'[/\-.]')
+_TIME_RE = re.compile(r'(\d{1,2}:\d{2})')
+
+# Dates and party sizes sit near the top of real inquiries; anything past
+# this is quoted threads or marketing HTML that only slows the regexes down
+_MAX_PARSE_CHARS = 8192
+
+# Month names as dateutil recognises them
+_MONTHS = {
+    name: number
+    for number, names in enumerate([
+        ('jan', 'january'), ('feb', 'february'), ('mar', 'march'), ('apr', 'april'),
+        ('may',), ('jun', 'june'), ('jul', 'july'), ('aug', 'august'),
+        ('sep', 'sept', 'september'), ('oct', 'october'), ('nov', 'november'), ('dec', 'december'),
+    ], 1)
+    for name in names
+}
+
+
+def _parse_numeric_date(date_str: str) -> datetime:
+    """Parse a regex-matched DD/MM/YYYY or DD/MM/YY string without dateutil"""
+    day_str, month_str, year_str = _DATE_SEP_RE.split(date_str)
+    separators = {date_str[len(day_str)], date_str[len(day_str) + len(month_str) + 1]}
+    if len(separators) > 1 and '.' in separators:
+        # dateutil rejects '.' mixed with '/' or '-'
+        raise ValueError(f"Mixed date separators: {date_str}")
+    day, month, year = int(day_str), int(month_str), int(year_str)
+    if year < 100:
+        year += 2000
+    if month > 12 and day <= 12:
+        # Not valid day-first - read month-first, as dateutil does
+        day, month = month, day
+    return datetime(year, month, day)
+
+
+def _parse_named_date(date_str: str, default_year: int) -> Optional[datetime]:
+    """Parse '25th December 2025' / 'Dec 25, 2025' / '3rd of March' without dateutil.
+
+    Returns None if a word is not a month name dateutil would recognise.
+    """
+    day = month = year = None
+    for token in date_str.lower().replace(',', ' ').split():
+        if token[0].isdigit():
+            digits = token.rstrip('stndrh')
+            if len(digits) == 4:
+                year = int(digits)
+            else:
+                day = int(digits)
+        elif token != 'of':
+            month = _MONTHS.get(token)
+            if month is None:
+                return None
+    if day is None or month is None:
+        return None
+    return datetime(year or default_year, month, day)
+
+
+# Keyword sets for the detectors below, one scan per field instead of one per keyword
+_BOOKING_KW = re.compile(r'booking request|book now|reserve')
+_CONFIRM_KW = re.compile(r'confirm booking|confirmed|approve booking')
+
+
+def is_booking_request(subject_lower: str, body_lower: str, booking_id: Optional[str]) -> bool:
     if "booking request" in subject_lower:
         return True
     
-    has_booking_ref = extract_booking_id(body) or extract_booking_id(subject)
-    booking_keywords = ['booking request', 'book now', 'reserve']
-    has_keyword = any(k in body_lower or k in subject_lower for k in booking_keywords)
+    # The booking ID is already extracted, so it is free to test before any scan;
+    # the subject is short, so it is searched before the body
+    if not booking_id:
+        return False
     
-    return has_booking_ref and has_keyword
+    return bool(_BOOKING_KW.search(subject_lower) or _BOOKING_KW.search(body_lower))
 
 
-def is_staff_confirmation(subject: str, body: str, from_email: str) -> bool:
-    subject_lower = subject.lower() if subject else ""
-    body_lower = body.lower() if body else ""
-    
-    confirm_keywords = ['confirm booking', 'confirmed', 'approve booking']
-    has_confirm = any(k in subject_lower or k in body_lower for k in confirm_keywords)
-    has_booking_ref = extract_booking_id(body) or extract_booking_id(subject)
+def is_staff_confirmation(subject_lower: str, body_lower: str, booking_id: Optional[str]) -> bool:
+    if not booking_id:
+        return False
     
-    return has_confirm and has_booking_ref
+    return bool(_CONFIRM_KW.search(subject_lower) or _CONFIRM_KW.search(body_lower))
 
 
 def parse_email_simple(subject: str, body: str) -> Dict:
     """Parse email to extract dates and player count - Enhanced version"""
-    full_text = f"{subject}\n{body}"
-    full_text_lower = full_text.lower()
-    result = {'players': 4, 'dates': []}
+    # Lowercased once so the patterns can match case-sensitively
+    full_text_lower = f"{subject}\n{body}"[:_MAX_PARSE_CHARS].lower()
+    result = {'players': 4, 'dates': [], 'time': None}
 
-    logging.info(f"🔍 PARSING EMAIL - Length: {len(full_text)} chars")
-    logging.info(f"   Subject: {subject[:100]}")
-    logging.info(f"   Body preview: {body[:200]}")
+    if not full_text_lower.strip():
+        logging.info("🔍 PARSING EMAIL - Empty subject and body, using defaults")
+        return result
+
+    logging.info(f"🔍 PARSING EMAIL - Length: {len(full_text_lower)} chars")
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        logging.info(f"   Subject: {subject[:100]}")
+        logging.info(f"   Body preview: {body[:200]}")
 
     # ========================================================================
     # EXTRACT PLAYER COUNT - Multiple patterns
     # ========================================================================
-    player_patterns = [
-        r'(\d+)\s*(?:players?|people|persons?|golfers?|guests?)',  # "4 players", "2 people"
-        r'(?:party|group)\s+of\s+(\d+)',                            # "party of 4", "group of 6"
-        r'(\d+)[-\s]ball',                                          # "4-ball", "2 ball"
-        r'(?:foursome|four\s*ball)',                                # "foursome" = 4
-        r'(?:twosome|two\s*ball)',                                  # "twosome" = 2
-        r'for\s+(\d+)',                                             # "booking for 4"
-        r'we\s+(?:are|have)\s+(\d+)',                               # "we are 6", "we have 4"
-    ]
+    first_hits = {}
+    for match in _PLAYER_COMBINED.finditer(full_text_lower):
+        first_hits.setdefault(match.lastgroup, match)
 
     player_found = False
-    for pattern in player_patterns:
-        match = re.search(pattern, full_text_lower)
+    for group, fixed_num in _PLAYER_GROUPS:
+        match = first_hits.get(group)
         if match:
-            if pattern in [r'(?:foursome|four\s*ball)', r'(?:twosome|two\s*ball)']:
-                # Fixed patterns without capture groups
-                num = 4 if 'four' in pattern else 2
+            if fixed_num is not None:
+                # Fixed patterns without a number
+                num = fixed_num
             else:
-                num = int(match.group(1))
+                num = int(match.group(group))
 
             if 1 <= num <= 20:
                 result['players'] = num
                 player_found = True
-                logging.info(f"📊 PARSED - Players: {num} (pattern: {pattern[:30]}...)")
+                logging.info(f"📊 PARSED - Players: {num} (pattern: {group})")
                 break
             else:
                 logging.warning(f"⚠️  PARSED - Players: {num} (out of range 1-20, using default 4)")
@@ -1270,71 +1523,79 @@ def parse_email_simple(subject: str, body: str) -> Dict:
     # ========================================================================
     # EXTRACT DATES - Multiple formats
     # ========================================================================
-    date_patterns = [
-        # ISO format: 2025-12-25
-        (r'(\d{4}-\d{2}-\d{2})', 'iso'),
-
-        # DD/MM/YYYY variants: 25/12/2025, 25-12-2025, 25.12.2025
-        (r'(\d{1,2}[/\-.]\d{1,2}[/\-.]\d{4})', 'dmy_full'),
-
-        # DD/MM/YY variants: 25/12/25
-        (r'(\d{1,2}[/\-.]\d{1,2}[/\-.]\d{2})(?!\d)', 'dmy_short'),
-
-        # Month name formats: December 25 2025, Dec 25, 25 December 2025, 25th Dec 2025
-        (r'(\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{4})', 'dmy_named_year'),
-        (r'((?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2}(?:st|nd|rd|th)?\s*,?\s+\d{4})', 'mdy_named_year'),
-        (r'(\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*)', 'dmy_named'),
-        (r'((?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2}(?:st|nd|rd|th)?)', 'mdy_named'),
-    ]
+    # Validation window and parse defaults - read the clock once per email
+    now = datetime.now()
+    today = now.date()
+    try:
+        two_years_ahead = today.replace(year=today.year + 2)
+    except ValueError:
+        # 29 February
+        two_years_ahead = today.replace(year=today.year + 2, day=28)
+    default_month_start = now.replace(day=1)
+
+    # Per-match debug lines are only built when DEBUG is actually on
+    log_debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+    dates_found = set()
+    last_end = {}
+    for match in _DATE_COMBINED.finditer(full_text_lower):
+        pattern_name = match.lastgroup
+        start, end = match.span(pattern_name)
+        if start < last_end.get(pattern_name, 0):
+            # Tail of this format's previous match, e.g. "5/12/2026" in "25/12/2026"
+            continue
+        last_end[pattern_name] = end
 
-    dates_found = []
-    for pattern, pattern_name in date_patterns:
-        for match in re.finditer(pattern, full_text_lower, re.IGNORECASE):
-            date_str = match.group(1).strip()
+        date_str = match.group(pattern_name).strip()
 
-            try:
-                # Parse based on pattern type
-                if pattern_name == 'iso':
-                    parsed_date = datetime.strptime(date_str, '%Y-%m-%d')
+        try:
+            # Parse based on pattern type
+            if pattern_name == 'iso':
+                parsed_date = datetime.strptime(date_str, '%Y-%m-%d')
+                if log_debug:
                     logging.debug(f"   Parsed ISO date: {date_str} -> {parsed_date.date()}")
 
-                elif pattern_name.startswith('dmy'):
-                    # UK format - day first
-                    parsed_date = date_parser.parse(date_str, fuzzy=True, dayfirst=True, default=datetime.now().replace(day=1))
+            elif pattern_name in ('dmy_full', 'dmy_short'):
+                # UK numeric format - day first, layout fixed by the regex
+                parsed_date = _parse_numeric_date(date_str)
+                if log_debug:
                     logging.debug(f"   Parsed DMY date: {date_str} -> {parsed_date.date()}")
 
-                elif pattern_name.startswith('mdy'):
-                    # US format - month first
-                    parsed_date = date_parser.parse(date_str, fuzzy=True, dayfirst=False, default=datetime.now().replace(day=1))
-                    logging.debug(f"   Parsed MDY date: {date_str} -> {parsed_date.date()}")
-
-                else:
-                    # Generic parsing
-                    parsed_date = date_parser.parse(date_str, fuzzy=True, dayfirst=True, default=datetime.now().replace(day=1))
-                    logging.debug(f"   Parsed generic date: {date_str} -> {parsed_date.date()}")
-
-                # Validation: Only future dates within next 2 years
-                today = datetime.now().date()
-                two_years_ahead = today.replace(year=today.year + 2)
-
-                if parsed_date.date() >= today and parsed_date.date() <= two_years_ahead:
-                    formatted = parsed_date.strftime('%Y-%m-%d')
-                    if formatted not in dates_found:
-                        dates_found.append(formatted)
+            else:
+                # Month name formats - only odd month words need dateutil
+                parsed_date = _parse_named_date(date_str, now.year)
+                if parsed_date is None:
+                    parsed_date = date_parser.parse(date_str, fuzzy=True, dayfirst=pattern_name.startswith('dmy'), default=default_month_start)
+                if log_debug:
+                    logging.debug(f"   Parsed named-month date: {date_str} -> {parsed_date.date()}")
+
+            # Validation: Only future dates within next 2 years
+            parsed_day = parsed_date.date()
+            if today <= parsed_day <= two_years_ahead:
+                formatted = parsed_date.strftime('%Y-%m-%d')
+                if formatted not in dates_found:
+                    dates_found.add(formatted)
+                    if log_debug:
                         logging.debug(f"   ✓ Valid date: {formatted}")
-                    else:
-                        logging.debug(f"   - Duplicate date: {formatted}")
-                else:
-                    logging.debug(f"   ✗ Date out of range: {parsed_date.date()} (must be {today} to {two_years_ahead})")
+                elif log_debug:
+                    logging.debug(f"   - Duplicate date: {formatted}")
+            elif log_debug:
+                logging.debug(f"   ✗ Date out of range: {parsed_day} (must be {today} to {two_years_ahead})")
 
-            except Exception as e:
+        except Exception as e:
+            if log_debug:
                 logging.debug(f"   ✗ Failed to parse '{date_str}' with pattern {pattern_name}: {e}")
-                continue
+            continue
 
     result['dates'] = sorted(dates_found)
 
+    # First HH:MM mention - booking request emails carry the chosen tee time
+    time_match = _TIME_RE.search(full_text_lower)
+    if time_match:
+        result['time'] = time_match.group(1)
+
     if dates_found:
-        logging.info(f"📅 PARSED - Dates found: {', '.join(dates_found)}")
+        logging.info(f"📅 PARSED - Dates found: {', '.join(result['dates'])}")
     else:
         logging.info(f"📅 PARSED - No valid dates found in email")
 
@@ -1346,6 +1607,12 @@ def parse_email_simple(subject: str, body: str) -> Dict:
 # WEBHOOK ENDPOINTS
 # ============================================================================
 
+@app.teardown_request
+def flush_log_buffer(exc):
+    """Write out the request's buffered log records in one go"""
+    _log_buffer.flush()
+
+
 @app.route('/health', methods=['GET'])
 def health():
     return jsonify({
@@ -1378,28 +1645,36 @@ def handle_inbound_email():
 
         message_id = extract_message_id(headers)
 
-        logging.info("="*60)
-        logging.info(f"INBOUND EMAIL - From: {from_email}")
-        logging.info(f"Subject: {subject}")
-        logging.info(f"Body type: {body_type}")
-        logging.info(f"Body preview: {body[:200]}..." if len(body) > 200 else f"Body: {body}")
-        logging.info("="*60)
+        logging.info(_SEP)
+        logging.info("INBOUND EMAIL - From: %s", from_email)
+        logging.info("Subject: %s", subject)
+        logging.info("Body type: %s", body_type)
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            if len(body) > 200:
+                logging.info("Body preview: %s...", body[:200])
+            else:
+                logging.info("Body: %s", body)
+        logging.info(_SEP)
         
         # Extract sender email
-        if '<' in from_email:
-            sender_email = from_email.split('<')[1].strip('>')
-        else:
-            sender_email = from_email
+        _, sender_email = parseaddr(from_email)
         
         if not sender_email or '@' not in sender_email:
             return jsonify({'status': 'invalid_email'}), 400
         
         parsed = parse_email_simple(subject, body)
+
+        subject_lower = subject.lower()
+        body_lower = body.lower()
+        # Most new inquiries carry no booking ID - rule that out with a
+        # substring test before running the ID regex over the body
+        booking_id = None
+        if _BOOKING_PREFIX in subject_lower or _BOOKING_PREFIX in body_lower:
+            booking_id = extract_booking_id(subject) or extract_booking_id(body)
         
         # CASE 1: Staff Confirmation
-        if is_staff_confirmation(subject, body, sender_email):
+        if is_staff_confirmation(subject_lower, body_lower, booking_id):
             logging.info("DETECTED: Staff Confirmation")
-            booking_id = extract_booking_id(subject) or extract_booking_id(body)
 
             if booking_id:
                 booking = get_booking_by_id(booking_id)
@@ -1420,16 +1695,15 @@ def handle_inbound_email():
                     if customer_email:
                         logging.info(f"📧 SENDING CONFIRMATION EMAIL - to {customer_email}")
                         html_email = format_confirmation_email(booking)
-                        send_email_sendgrid(customer_email, "Booking Confirmed - Royal Portrush Golf Club", html_email)
+                        _MAIL_POOL.submit(send_email_background, customer_email, "Booking Confirmed - Royal Portrush Golf Club", html_email)
 
                     return jsonify({'status': 'confirmed', 'booking_id': booking_id}), 200
 
             return jsonify({'status': 'no_booking_id'}), 200
         
         # CASE 2: Booking Request
-        elif is_booking_request(subject, body):
+        elif is_booking_request(subject_lower, body_lower, booking_id):
             logging.info("DETECTED: Booking Request")
-            booking_id = extract_booking_id(subject) or extract_booking_id(body)
 
             if booking_id:
                 timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -1438,16 +1712,13 @@ def handle_inbound_email():
                     'note': f"Customer sent booking request on {timestamp}"
                 }
 
-                # Extract date and time
-                date_match = re.search(r'(\d{4}-\d{2}-\d{2})', subject + body)
-                time_match = re.search(r'(\d{1,2}:\d{2})', subject + body)
-
-                if date_match:
-                    updates['date'] = date_match.group(1)
-                    logging.info(f"📅 EXTRACTED DATE - {date_match.group(1)}")
-                if time_match:
-                    updates['tee_time'] = time_match.group(1)
-                    logging.info(f"🕐 EXTRACTED TIME - {time_match.group(1)}")
+                # Date and time were already picked out by parse_email_simple
+                if parsed['dates']:
+                    updates['date'] = parsed['dates'][0]
+                    logging.info(f"📅 EXTRACTED DATE - {parsed['dates'][0]}")
+                if parsed.get('time'):
+                    updates['tee_time'] = parsed['time']
+                    logging.info(f"🕐 EXTRACTED TIME - {parsed['time']}")
 
                 logging.info(f"🔄 UPDATING BOOKING - {booking_id} to 'Requested' status")
                 update_booking_in_db(booking_id, updates)
@@ -1461,7 +1732,7 @@ def handle_inbound_email():
                     logging.info(f"   Total: £{booking_data.get('total', 0):.2f}")
 
                     html_email = format_acknowledgment_email(booking_data)
-                    send_email_sendgrid(sender_email, "Your Booking Request - Royal Portrush Golf Club", html_email)
+                    _MAIL_POOL.submit(send_email_background, sender_email, "Your Booking Request - Royal Portrush Golf Club", html_email)
 
                 return jsonify({'status': 'requested', 'booking_id': booking_id}), 200
 
@@ -1548,7 +1819,7 @@ def handle_inbound_email():
                 html_email = format_no_availability_email(parsed['players'])
                 subject_line = "Tee Time Inquiry - Royal Portrush Golf Club"
 
-            send_email_sendgrid(sender_email, subject_line, html_email)
+            _MAIL_POOL.submit(send_email_background, sender_email, subject_line, html_email)
 
             return jsonify({'status': 'inquiry_created', 'booking_id': booking_id}), 200
     
@@ -1561,34 +1832,52 @@ def handle_inbound_email():
 # API ENDPOINTS FOR DASHBOARD
 # ============================================================================
 
+def _page_args(default_limit: int = 200, max_limit: int = 1000):
+    """Read limit/offset query args for the list endpoints, or None if they aren't integers"""
+    try:
+        limit = int(request.args.get('limit', default_limit))
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return None
+    return min(max(limit, 1), max_limit), max(offset, 0)
+
+
 @app.route('/api/bookings', methods=['GET'])
 def api_get_bookings():
-    """Get all bookings"""
+    """Get bookings, newest first, one page at a time"""
     try:
+        page = _page_args()
+        if page is None:
+            return jsonify({'success': False, 'error': 'limit and offset must be integers'}), 400
+        limit, offset = page
+        
         conn = get_db_connection()
         if not conn:
             return jsonify({'success': False, 'error': 'No database connection'}), 500
         
+        # Dates and totals are formatted in SQL so rows are JSON-ready as fetched
         cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute("SELECT * FROM bookings WHERE club = %s ORDER BY timestamp DESC", (DEFAULT_COURSE_ID,))
-        bookings = cursor.fetchall()
+        cursor.execute("""
+            SELECT id, booking_id, message_id, confirmation_message_id,
+                   to_char(timestamp, 'YYYY-MM-DD HH24:MI:SS') AS timestamp,
+                   guest_email, guest_name, dates,
+                   to_char(date, 'YYYY-MM-DD') AS date,
+                   tee_time, players, total::float AS total, status, note,
+                   club, club_name, customer_confirmed_at,
+                   to_char(created_at, 'YYYY-MM-DD HH24:MI:SS') AS created_at,
+                   to_char(updated_at, 'YYYY-MM-DD HH24:MI:SS') AS updated_at,
+                   updated_by
+            FROM bookings
+            WHERE club = %s
+            ORDER BY bookings.timestamp DESC
+            LIMIT %s OFFSET %s
+        """, (DEFAULT_COURSE_ID, limit, offset))
+        booking_list = cursor.fetchall()
         cursor.close()
         release_db_connection(conn)
         
-        # Convert to serializable format
-        booking_list = []
-        for b in bookings:
-            bd = dict(b)
-            for f in ['timestamp', 'created_at', 'updated_at']:
-                if bd.get(f) and hasattr(bd[f], 'strftime'):
-                    bd[f] = bd[f].strftime('%Y-%m-%d %H:%M:%S')
-            if bd.get('date') and hasattr(bd['date'], 'strftime'):
-                bd['date'] = bd['date'].strftime('%Y-%m-%d')
-            if bd.get('total'):
-                bd['total'] = float(bd['total'])
-            booking_list.append(bd)
-        
-        return jsonify({'success': True, 'bookings': booking_list, 'count': len(booking_list)})
+        return jsonify({'success': True, 'bookings': booking_list, 'count': len(booking_list),
+                        'limit': limit, 'offset': offset})
     
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1608,8 +1897,13 @@ def api_update_booking(booking_id):
 
 @app.route('/api/tee-times', methods=['GET'])
 def api_get_tee_times():
-    """Get all tee times"""
+    """Get tee times, one page at a time"""
     try:
+        page = _page_args()
+        if page is None:
+            return jsonify({'success': False, 'error': 'limit and offset must be integers'}), 400
+        limit, offset = page
+        
         conn = get_db_connection()
         if not conn:
             return jsonify({'success': False, 'error': 'No database connection'}), 500
@@ -1619,7 +1913,13 @@ def api_get_tee_times():
         date_from = request.args.get('from')
         date_to = request.args.get('to')
         
-        query = "SELECT * FROM tee_times WHERE club = %s"
+        query = """
+            SELECT id, club, to_char(date, 'YYYY-MM-DD') AS date, time,
+                   max_players, available_slots, is_available,
+                   green_fee::float AS green_fee, notes, version, created_at, updated_at
+            FROM tee_times
+            WHERE club = %s
+        """
         params = [DEFAULT_COURSE_ID]
         
         if date_from:
@@ -1629,23 +1929,16 @@ def api_get_tee_times():
             query += " AND date <= %s"
             params.append(date_to)
         
-        query += " ORDER BY date ASC, time ASC"
+        query += " ORDER BY tee_times.date ASC, time ASC LIMIT %s OFFSET %s"
+        params.extend([limit, offset])
         
         cursor.execute(query, params)
-        tee_times = cursor.fetchall()
+        tt_list = cursor.fetchall()
         cursor.close()
         release_db_connection(conn)
         
-        tt_list = []
-        for t in tee_times:
-            td = dict(t)
-            if td.get('date') and hasattr(td['date'], 'strftime'):
-                td['date'] = td['date'].strftime('%Y-%m-%d')
-            if td.get('green_fee'):
-                td['green_fee'] = float(td['green_fee'])
-            tt_list.append(td)
-        
-        return jsonify({'success': True, 'tee_times': tt_list, 'count': len(tt_list)})
+        return jsonify({'success': True, 'tee_times': tt_list, 'count': len(tt_list),
+                        'limit': limit, 'offset': offset})
     
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1653,13 +1946,20 @@ def api_get_tee_times():
 
 @app.route('/api/tee-times', methods=['POST'])
 def api_add_tee_time():
-    """Add a new tee time slot"""
+    """
+    Add a new tee time slot, or overwrite the existing one.
+    
+    Pass the 'version' from GET /api/tee-times to only overwrite the slot
+    as it was read: if anyone has changed it since, nothing is written and
+    a 409 is returned so the dashboard can reload and retry.
+    """
     try:
         data = request.json
         date = data.get('date')
         time = data.get('time')
         max_players = data.get('max_players', 4)
         green_fee = data.get('green_fee', PER_PLAYER_FEE)
+        version = data.get('version')
         
         if not date or not time:
             return jsonify({'success': False, 'error': 'Date and time required'}), 400
@@ -1677,14 +1977,27 @@ def api_add_tee_time():
                 available_slots = EXCLUDED.available_slots,
                 green_fee = EXCLUDED.green_fee,
                 is_available = TRUE,
+                version = tee_times.version + 1,
                 updated_at = CURRENT_TIMESTAMP
-        """, (DEFAULT_COURSE_ID, date, time, max_players, max_players, green_fee))
+            WHERE %s IS NULL OR tee_times.version = %s
+            RETURNING version
+        """, (DEFAULT_COURSE_ID, date, time, max_players, max_players, green_fee, version, version))
+        
+        saved = cursor.fetchone()
+        if saved is None:
+            # The WHERE skipped the update - the row's version moved on
+            conn.rollback()
+            cursor.close()
+            release_db_connection(conn)
+            return jsonify({'success': False,
+                            'error': 'Tee time was changed by someone else - reload and try again'}), 409
         
         conn.commit()
         cursor.close()
         release_db_connection(conn)
         
-        return jsonify({'success': True, 'message': f'Tee time added: {date} at {time}'})
+        return jsonify({'success': True, 'message': f'Tee time added: {date} at {time}',
+                        'version': saved[0]})
     
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1710,6 +2023,10 @@ def api_delete_tee_time(tee_time_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+# Weekdays open for visitor tee times (Mon, Tue, Thu, Fri)
+_BULK_WEEKDAYS = frozenset({0, 1, 3, 4})
+
+
 @app.route('/api/tee-times/bulk', methods=['POST'])
 def api_bulk_add_tee_times():
     """Bulk add tee times for a date range"""
@@ -1733,22 +2050,23 @@ def api_bulk_add_tee_times():
         start = datetime.strptime(start_date, '%Y-%m-%d')
         end = datetime.strptime(end_date, '%Y-%m-%d')
         
-        added_count = 0
-        current = start
+        # Skip Wed, Sat, Sun
+        day_dates = (start + timedelta(days=i) for i in range((end - start).days + 1))
+        date_strs = [d.strftime('%Y-%m-%d') for d in day_dates if d.weekday() in _BULK_WEEKDAYS]
+        rows = [(DEFAULT_COURSE_ID, date_str, time, max_players, max_players, green_fee)
+                for date_str in date_strs for time in times]
         
-        while current <= end:
-            # Skip Wed, Sat, Sun
-            if current.weekday() not in [2, 5, 6]:
-                date_str = current.strftime('%Y-%m-%d')
-                for time in times:
-                    cursor.execute("""
-                        INSERT INTO tee_times (club, date, time, max_players, available_slots, green_fee, is_available)
-                        VALUES (%s, %s, %s, %s, %s, %s, TRUE)
-                        ON CONFLICT (club, date, time) DO NOTHING
-                    """, (DEFAULT_COURSE_ID, date_str, time, max_players, max_players, green_fee))
-                    if cursor.rowcount > 0:
-                        added_count += 1
-            current += timedelta(days=1)
+        # One multi-row INSERT per 500 slots instead of a round-trip per slot;
+        # RETURNING counts only the rows that didn't hit the conflict
+        added_count = 0
+        if rows:
+            inserted = execute_values(cursor, """
+                INSERT INTO tee_times (club, date, time, max_players, available_slots, green_fee, is_available)
+                VALUES %s
+                ON CONFLICT (club, date, time) DO NOTHING
+                RETURNING 1
+            """, rows, template="(%s, %s, %s, %s, %s, %s, TRUE)", page_size=500, fetch=True)
+            added_count = len(inserted)
         
         conn.commit()
         cursor.close()
@@ -1783,12 +2101,12 @@ def api_check_availability():
 # INITIALIZE
 # ============================================================================
 
-logging.info("="*60)
+logging.info(_SEP)
 logging.info("Royal Portrush Golf Club - Email Bot")
-logging.info("="*60)
+logging.info(_SEP)
 logging.info("Availability Source: LOCAL DATABASE")
 logging.info("Email Flow: Inquiry -> Requested -> Confirmed")
-logging.info("="*60)
+logging.info(_SEP)
 
 if init_db_pool():
     init_database()
@@ -1797,7 +2115,8 @@ if init_db_pool():
 logging.info(f"SendGrid: {FROM_EMAIL}")
 logging.info(f"Club Email: {CLUB_BOOKING_EMAIL}")
 logging.info(f"Green Fee: {CURRENCY_SYMBOL}{PER_PLAYER_FEE}")
-logging.info("="*60)
+logging.info(_SEP)
+_log_buffer.flush()
 
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
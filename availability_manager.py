@@ -10,9 +10,16 @@ TEE_TIMES TABLE STRUCTURE (from email bot):
         id, club, date, time, max_players, 
         available_slots,  ← This gets decremented when booking is Confirmed
         is_available,     ← Set to FALSE when fully booked
-        green_fee, notes, created_at, updated_at
+        green_fee, notes,
+        version,          ← Bumped on every write (optimistic locking)
+        created_at, updated_at
     )
 
+The manager's own slot writes serialise with row locks (FOR UPDATE)
+rather than version checks. version is for edits of a row read earlier:
+the dashboard passes it back to POST /api/tee-times, which refuses the
+write if the slot has changed since (including a confirm or release here).
+
 SLOT RESERVATION LOGIC:
 - "Inquiry" / "Pending" / "Requested" = available_slots UNCHANGED
 - "Confirmed" / "Booked" = available_slots DECREMENTED
@@ -28,15 +35,26 @@ WORKFLOW:
 
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional, Tuple
 import logging
 import os
 import re
+import threading
+import time
+
+from prepared_statements import PooledConnection, execute_prepared
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# HH:MM inside stored times like '10:00 AM', and the stored date format
+_TIME_RE = re.compile(r'(\d{1,2}:\d{2})')
+_DATE_FMT = '%Y-%m-%d'
+
 # Statuses that RESERVE a slot (available_slots is decremented)
 SLOT_RESERVING_STATUSES = ['Confirmed', 'Booked']
 
@@ -57,13 +75,187 @@ class AvailabilityManager:
     - Set is_available = TRUE if it was FALSE
     """
     
+    # Connection pools shared by all managers, one per connection string
+    _POOLS: Dict[str, ThreadedConnectionPool] = {}
+    _POOLS_LOCK = threading.Lock()
+    
+    # Short-lived cache of available times for the dashboard's polling:
+    # (connection string, club, date, min_players) -> (expires_at, slots).
+    # Per process: other workers only see a change once their entry expires
+    _TIMES_CACHE: Dict[tuple, tuple] = {}
+    _TIMES_CACHE_LOCK = threading.Lock()
+    _TIMES_CACHE_TTL = 5
+    _TIMES_CACHE_SIZE = 1024
+    
+    # Hot-path queries, PREPAREd on first use per pooled connection so Postgres parses
+    # and plans them once: name -> (parameter types, statement)
+    _STATEMENTS = {
+        'am_check_slot': ("(text, date, text)", """
+            SELECT 
+                id,
+                date,
+                time,
+                max_players,
+                available_slots,
+                is_available,
+                green_fee
+            FROM tee_times
+            WHERE club = $1 
+            AND date = $2
+            AND time = $3
+        """),
+        'am_can_confirm': ("(text, text)", r"""
+            SELECT
+                b.booking_id, b.date, b.tee_time, b.players, b.status, b.club,
+                t.id, t.max_players, t.available_slots, t.is_available, t.green_fee
+            FROM bookings b
+            LEFT JOIN tee_times t
+                ON t.club = COALESCE(NULLIF(b.club, ''), $1)
+                AND t.date = b.date
+                AND t.time = COALESCE(substring(b.tee_time from '\d{1,2}:\d{2}'), btrim(b.tee_time))
+            WHERE b.booking_id = $2
+        """),
+        'am_confirm': ("(text, text, text)", r"""
+            WITH b AS (
+                UPDATE bookings
+                SET status = 'Confirmed',
+                    updated_at = NOW(),
+                    updated_by = $1,
+                    customer_confirmed_at = NOW()
+                WHERE booking_id = $2
+                AND status IN ('Requested', 'Inquiry', 'Pending')
+                RETURNING
+                    COALESCE(NULLIF(players, 0), 1) AS players,
+                    COALESCE(NULLIF(club, ''), $3) AS club,
+                    date,
+                    COALESCE(substring(tee_time from '\d{1,2}:\d{2}'), btrim(tee_time)) AS time
+            ),
+            nxt AS (
+                SELECT tt.id, tt.available_slots - b.players AS new_slots, b.players
+                FROM tee_times tt
+                JOIN b
+                    ON tt.club = b.club
+                    AND tt.date = b.date
+                    AND tt.time = b.time
+                WHERE tt.is_available
+                AND tt.available_slots >= b.players
+                FOR UPDATE OF tt
+            ),
+            t AS (
+                UPDATE tee_times tt
+                SET available_slots = nxt.new_slots,
+                    is_available = nxt.new_slots > 0,
+                    version = tt.version + 1,
+                    updated_at = NOW()
+                FROM nxt
+                WHERE tt.id = nxt.id
+                RETURNING tt.id, tt.available_slots, nxt.players, tt.club, tt.date
+            )
+            SELECT id, available_slots, players, club, date FROM t
+        """),
+        'am_release_booking': ("(text, text)", r"""
+            SELECT
+                b.booking_id, b.date, b.players, b.status,
+                COALESCE(NULLIF(b.club, ''), $2) AS club,
+                t.id, t.max_players, t.available_slots
+            FROM bookings b
+            LEFT JOIN LATERAL (
+                SELECT id, max_players, available_slots
+                FROM tee_times
+                WHERE club = COALESCE(NULLIF(b.club, ''), $2)
+                AND date = b.date
+                AND time = COALESCE(substring(b.tee_time from '\d{1,2}:\d{2}'), btrim(b.tee_time))
+                FOR UPDATE
+            ) t ON TRUE
+            WHERE b.booking_id = $1
+            FOR UPDATE OF b
+        """),
+        'am_set_status': ("(text, text, text)", """
+            UPDATE bookings
+            SET status = $1, updated_at = NOW(), updated_by = $2
+            WHERE booking_id = $3
+        """),
+        'am_release_slot': ("(text, text, text, int, int)", """
+            WITH b AS (
+                UPDATE bookings
+                SET status = $1, updated_at = NOW(), updated_by = $2
+                WHERE booking_id = $3
+            )
+            UPDATE tee_times
+            SET available_slots = LEAST(available_slots + $4, max_players),
+                is_available = TRUE,
+                version = version + 1,
+                updated_at = NOW()
+            WHERE id = $5
+            RETURNING available_slots
+        """),
+        'am_available_times': ("(text, date, int)", """
+            SELECT 
+                id,
+                time,
+                max_players,
+                available_slots,
+                green_fee
+            FROM tee_times
+            WHERE club = $1 
+            AND date = $2
+            AND is_available = TRUE
+            AND available_slots >= $3
+            ORDER BY time ASC
+        """),
+    }
+    
     def __init__(self, db_connection_string: str = None):
         self.db_conn = db_connection_string or os.getenv("DATABASE_URL")
         self.DEFAULT_COURSE_ID = os.getenv("DEFAULT_COURSE_ID", "royalportrush")
     
+    def _get_pool(self) -> ThreadedConnectionPool:
+        """Create the pool for this connection string on first use"""
+        pool = self._POOLS.get(self.db_conn)
+        if pool is None:
+            with self._POOLS_LOCK:
+                pool = self._POOLS.get(self.db_conn)
+                if pool is None:
+                    pool = ThreadedConnectionPool(minconn=2, maxconn=20, dsn=self.db_conn,
+                                                  connection_factory=PooledConnection)
+                    self._POOLS[self.db_conn] = pool
+        return pool
+    
+    @contextmanager
     def get_connection(self):
-        """Get database connection"""
-        return psycopg2.connect(self.db_conn)
+        """
+        Get a pooled database connection.
+        
+        Commits on normal exit and rolls back on error, like `with conn:`,
+        then returns the connection to the pool.
+        """
+        pool = self._get_pool()
+        conn = pool.getconn()
+        try:
+            with conn:
+                yield conn
+        finally:
+            pool.putconn(conn)
+    
+    @contextmanager
+    def _connection(self, conn=None):
+        """
+        Use the caller's connection if one is passed, else a pooled one.
+        
+        A passed-in connection belongs to the caller's transaction: methods
+        don't commit it (the caller does), but a failed write rolls it back.
+        """
+        if conn is not None:
+            yield conn
+        else:
+            with self.get_connection() as own_conn:
+                yield own_conn
+    
+    def _invalidate_times(self, club_id: str, date_str: str):
+        """Drop cached available times for a club/date after its slots change"""
+        with self._TIMES_CACHE_LOCK:
+            for key in [k for k in self._TIMES_CACHE if k[:3] == (self.db_conn, club_id, date_str)]:
+                del self._TIMES_CACHE[key]
     
     def _normalize_time(self, time_str: str) -> str:
         """Normalize time format (handle '10:00 AM' vs '10:00')"""
@@ -73,18 +265,20 @@ class AvailabilityManager:
         time_str = str(time_str).strip()
         
         # Extract just HH:MM
-        match = re.search(r'(\d{1,2}:\d{2})', time_str)
-        if match:
-            return match.group(1)
-        
-        return time_str
+        match = _TIME_RE.search(time_str)
+        return match.group(1) if match else time_str
     
     def _normalize_date(self, date_input) -> str:
         """Convert date to string format YYYY-MM-DD"""
         if isinstance(date_input, str):
             return date_input
+        # isoformat() is a C builtin - no format string to interpret
+        if isinstance(date_input, datetime):
+            return date_input.date().isoformat()
+        if isinstance(date_input, date):
+            return date_input.isoformat()
         if hasattr(date_input, 'strftime'):
-            return date_input.strftime('%Y-%m-%d')
+            return date_input.strftime(_DATE_FMT)
         return str(date_input)
     
     def check_slot_availability(
@@ -92,7 +286,8 @@ class AvailabilityManager:
         requested_date, 
         requested_time: str, 
         num_players: int,
-        club_id: str = None
+        club_id: str = None,
+        conn=None
     ) -> Dict:
         """
         Check if a specific time slot has enough available_slots.
@@ -112,59 +307,51 @@ class AvailabilityManager:
         date_str = self._normalize_date(requested_date)
         time_str = self._normalize_time(requested_time)
         
-        with self.get_connection() as conn:
+        with self._connection(conn) as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 # Query the tee_times table directly
-                cur.execute("""
-                    SELECT 
-                        id,
-                        date,
-                        time,
-                        max_players,
-                        available_slots,
-                        is_available,
-                        green_fee
-                    FROM tee_times
-                    WHERE club = %s 
-                    AND date = %s
-                    AND time = %s
-                """, (club_id, date_str, time_str))
+                execute_prepared(cur, 'am_check_slot', self._STATEMENTS, (club_id, date_str, time_str))
                 
                 slot = cur.fetchone()
                 
-                if not slot:
-                    # No tee time exists for this date/time
-                    return {
-                        'available': False,
-                        'available_slots': 0,
-                        'max_players': 0,
-                        'can_accommodate': False,
-                        'tee_time_id': None,
-                        'reason': 'Tee time slot does not exist'
-                    }
-                
-                available = slot['available_slots'] or 0
-                max_players = slot['max_players'] or 4
-                is_available = slot['is_available']
-                
-                can_accommodate = is_available and available >= num_players
-                
-                return {
-                    'available': is_available and available > 0,
-                    'available_slots': available,
-                    'max_players': max_players,
-                    'can_accommodate': can_accommodate,
-                    'tee_time_id': slot['id'],
-                    'green_fee': float(slot['green_fee']) if slot['green_fee'] else None,
-                    'requested_players': num_players,
-                    'date': date_str,
-                    'time': time_str
-                }
+                return self._slot_availability(slot, num_players, date_str, time_str)
+    
+    def _slot_availability(self, slot: Optional[Dict], num_players: int, date_str: str, time_str: str) -> Dict:
+        """Build the check_slot_availability result from a tee_times row (or None)"""
+        if not slot:
+            # No tee time exists for this date/time
+            return {
+                'available': False,
+                'available_slots': 0,
+                'max_players': 0,
+                'can_accommodate': False,
+                'tee_time_id': None,
+                'reason': 'Tee time slot does not exist'
+            }
+        
+        available = slot['available_slots'] or 0
+        max_players = slot['max_players'] or 4
+        is_available = slot['is_available']
+        
+        can_accommodate = is_available and available >= num_players
+        
+        return {
+            'available': is_available and available > 0,
+            'available_slots': available,
+            'max_players': max_players,
+            'can_accommodate': can_accommodate,
+            'tee_time_id': slot['id'],
+            'green_fee': float(slot['green_fee']) if slot['green_fee'] else None,
+            'requested_players': num_players,
+            'date': date_str,
+            'time': time_str
+        }
     
     def can_confirm_booking(
         self,
         booking_id: str,
-        club_id: str = None
+        club_id: str = None,
+        conn=None
     ) -> Tuple[bool, str, Dict]:
         """
         Check if a booking can be moved from 'Requested' to 'Confirmed'.
@@ -176,14 +363,10 @@ class AvailabilityManager:
         """
         club_id = club_id or self.DEFAULT_COURSE_ID
         
-        with self.get_connection() as conn:
+        with self._connection(conn) as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Get the booking details
-                cur.execute("""
-                    SELECT booking_id, date, tee_time, players, status, club
-                    FROM bookings
-                    WHERE booking_id = %s
-                """, (booking_id,))
+                # Booking and its tee_times row in one round-trip
+                execute_prepared(cur, 'am_can_confirm', self._STATEMENTS, (club_id, booking_id))
                 
                 booking = cur.fetchone()
                 
@@ -207,12 +390,12 @@ class AvailabilityManager:
                 if not booking_date or not booking_time:
                     return False, "Booking has no date or time set", {}
                 
-                # Check availability in tee_times table
-                availability = self.check_slot_availability(
-                    requested_date=booking_date,
-                    requested_time=booking_time,
-                    num_players=players,
-                    club_id=booking['club'] or club_id
+                # No joined tee_times row leaves t.id NULL
+                availability = self._slot_availability(
+                    booking if booking['id'] is not None else None,
+                    players,
+                    self._normalize_date(booking_date),
+                    self._normalize_time(booking_time)
                 )
                 
                 if availability['can_accommodate']:
@@ -226,85 +409,64 @@ class AvailabilityManager:
     def confirm_booking(
         self,
         booking_id: str,
-        confirmed_by: str
+        confirmed_by: str,
+        conn=None
     ) -> Tuple[bool, str]:
         """
         Move booking from 'Requested' to 'Confirmed' and DECREMENT available_slots.
         
-        This is the key function - it:
-        1. Checks availability
-        2. Updates booking status to 'Confirmed'
-        3. Decrements tee_times.available_slots
-        4. Sets is_available = FALSE if slots reach 0
+        This is the key function - in a single statement it:
+        1. Updates booking status to 'Confirmed'
+        2. Decrements tee_times.available_slots if there is room
+        3. Sets is_available = FALSE if slots reach 0
+        If there isn't room nothing is changed and the reason is reported.
         
         Returns:
             (success: bool, message: str)
         """
-        # First check if we can confirm
-        can_confirm, message, availability = self.can_confirm_booking(booking_id)
-        
-        if not can_confirm:
-            logger.warning(f"Cannot confirm booking {booking_id}: {message}")
-            return False, message
-        
-        tee_time_id = availability.get('tee_time_id')
-        players = availability.get('requested_players', 1)
+        owns_conn = conn is None
         
-        with self.get_connection() as conn:
+        with self._connection(conn) as conn:
             with conn.cursor() as cur:
                 try:
-                    # Start transaction
-                    
-                    # 1. Update booking status
-                    cur.execute("""
-                        UPDATE bookings
-                        SET status = 'Confirmed',
-                            updated_at = NOW(),
-                            updated_by = %s,
-                            customer_confirmed_at = NOW()
-                        WHERE booking_id = %s
-                        AND status IN ('Requested', 'Inquiry', 'Pending')
-                    """, (confirmed_by, booking_id))
+                    # One statement: status change and slot decrement commit together,
+                    # and the available_slots >= players guard stops overbooking
+                    execute_prepared(cur, 'am_confirm', self._STATEMENTS,
+                                     (confirmed_by, booking_id, self.DEFAULT_COURSE_ID))
                     
-                    if cur.rowcount == 0:
-                        conn.rollback()
-                        return False, "Booking not found or already confirmed"
-                    
-                    # 2. Decrement available_slots in tee_times
-                    cur.execute("""
-                        UPDATE tee_times
-                        SET available_slots = available_slots - %s,
-                            is_available = CASE 
-                                WHEN available_slots - %s <= 0 THEN FALSE 
-                                ELSE TRUE 
-                            END,
-                            updated_at = NOW()
-                        WHERE id = %s
-                        AND available_slots >= %s
-                    """, (players, players, tee_time_id, players))
+                    row = cur.fetchone()
                     
-                    if cur.rowcount == 0:
+                    if row is None:
                         conn.rollback()
-                        return False, "Failed to update tee time slots - may have been booked by someone else"
-                    
-                    conn.commit()
-                    
-                    new_available = availability['available_slots'] - players
-                    logger.info(f"Booking {booking_id} confirmed by {confirmed_by}")
-                    logger.info(f"Tee time {tee_time_id}: {availability['available_slots']} → {new_available} slots")
-                    
-                    return True, f"Booking confirmed! {new_available} spots remaining for this time."
+                    elif owns_conn:
+                        conn.commit()
                     
                 except Exception as e:
                     conn.rollback()
                     logger.error(f"Error confirming booking: {e}")
                     return False, str(e)
+            
+            if row is None:
+                # Nothing changed - re-check to report why
+                can_confirm, message, _ = self.can_confirm_booking(booking_id, conn=conn)
+                if can_confirm:
+                    message = "Failed to update tee time slots - may have been booked by someone else"
+                logger.warning(f"Cannot confirm booking {booking_id}: {message}")
+                return False, message
+        
+        tee_time_id, new_available, players, club_id, tee_date = row
+        self._invalidate_times(club_id, self._normalize_date(tee_date))
+        logger.info(f"Booking {booking_id} confirmed by {confirmed_by}")
+        logger.info(f"Tee time {tee_time_id}: {new_available + players} → {new_available} slots")
+        
+        return True, f"Booking confirmed! {new_available} spots remaining for this time."
     
     def release_booking_slot(
         self,
         booking_id: str,
         released_by: str,
-        new_status: str = 'Requested'
+        new_status: str = 'Requested',
+        conn=None
     ) -> Tuple[bool, str]:
         """
         Release a slot when reverting from 'Confirmed' back to 'Requested' or 'Cancelled'.
@@ -314,16 +476,18 @@ class AvailabilityManager:
         Use this when:
         - Staff clicks "← Requested" to revert a confirmed booking
         - Staff cancels a confirmed booking
+        
+        The booking and tee time rows are locked while it runs, so concurrent
+        releases wait for each other rather than failing with a retry.
         """
-        with self.get_connection() as conn:
+        owns_conn = conn is None
+        
+        with self._connection(conn) as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 try:
-                    # Get booking details
-                    cur.execute("""
-                        SELECT booking_id, date, tee_time, players, status, club
-                        FROM bookings
-                        WHERE booking_id = %s
-                    """, (booking_id,))
+                    # Booking and its tee time in one read; both rows stay locked until
+                    # commit, so concurrent releases can't both restore slots
+                    execute_prepared(cur, 'am_release_booking', self._STATEMENTS, (booking_id, self.DEFAULT_COURSE_ID))
                     
                     booking = cur.fetchone()
                     
@@ -335,62 +499,40 @@ class AvailabilityManager:
                     # Only release slots if currently Confirmed or Booked
                     if current_status not in SLOT_RESERVING_STATUSES:
                         # Just update status, no slot release needed
-                        cur.execute("""
-                            UPDATE bookings
-                            SET status = %s, updated_at = NOW(), updated_by = %s
-                            WHERE booking_id = %s
-                        """, (new_status, released_by, booking_id))
-                        conn.commit()
+                        execute_prepared(cur, 'am_set_status', self._STATEMENTS, (new_status, released_by, booking_id))
+                        if owns_conn:
+                            conn.commit()
                         return True, f"Status changed to {new_status}"
                     
                     players = booking['players'] or 1
-                    booking_date = booking['date']
-                    booking_time = self._normalize_time(booking['tee_time'])
-                    club_id = booking['club'] or self.DEFAULT_COURSE_ID
-                    
-                    # Find the tee_time record
-                    date_str = self._normalize_date(booking_date)
-                    
-                    cur.execute("""
-                        SELECT id, max_players, available_slots
-                        FROM tee_times
-                        WHERE club = %s AND date = %s AND time = %s
-                    """, (club_id, date_str, booking_time))
+                    club_id = booking['club']
+                    date_str = self._normalize_date(booking['date'])
                     
-                    tee_time = cur.fetchone()
-                    
-                    if not tee_time:
+                    if booking['id'] is None:
                         # No tee_time record - just update booking status
-                        cur.execute("""
-                            UPDATE bookings
-                            SET status = %s, updated_at = NOW(), updated_by = %s
-                            WHERE booking_id = %s
-                        """, (new_status, released_by, booking_id))
-                        conn.commit()
+                        execute_prepared(cur, 'am_set_status', self._STATEMENTS, (new_status, released_by, booking_id))
+                        if owns_conn:
+                            conn.commit()
                         return True, f"Status changed to {new_status} (no tee time record to update)"
                     
-                    tee_time_id = tee_time['id']
-                    max_players = tee_time['max_players']
+                    tee_time_id = booking['id']
                     
-                    # 1. Update booking status
-                    cur.execute("""
-                        UPDATE bookings
-                        SET status = %s, updated_at = NOW(), updated_by = %s
-                        WHERE booking_id = %s
-                    """, (new_status, released_by, booking_id))
+                    # Booking status and slot increment (capped at max_players) in one
+                    # statement. The tee time row has been locked since the read above,
+                    # so no version check is needed - concurrent writers wait for this
+                    # commit instead of being sent back to retry
+                    execute_prepared(
+                        cur, 'am_release_slot', self._STATEMENTS,
+                        (new_status, released_by, booking_id, players, tee_time_id)
+                    )
                     
-                    # 2. Increment available_slots (but don't exceed max_players)
-                    cur.execute("""
-                        UPDATE tee_times
-                        SET available_slots = LEAST(available_slots + %s, max_players),
-                            is_available = TRUE,
-                            updated_at = NOW()
-                        WHERE id = %s
-                    """, (players, tee_time_id))
+                    released = cur.fetchone()
                     
-                    conn.commit()
+                    if owns_conn:
+                        conn.commit()
+                    self._invalidate_times(club_id, date_str)
                     
-                    new_available = min(tee_time['available_slots'] + players, max_players)
+                    new_available = released['available_slots']
                     logger.info(f"Booking {booking_id} released by {released_by}")
                     logger.info(f"Tee time {tee_time_id}: slots restored to {new_available}")
                     
@@ -410,41 +552,44 @@ class AvailabilityManager:
         """
         Get all available time slots for a specific date.
         
-        Reads directly from tee_times table.
+        Reads from tee_times, cached for a few seconds; confirming or
+        releasing a slot clears that date's entries in this process. Other
+        processes may return stale times until _TIMES_CACHE_TTL runs out.
         """
         club_id = club_id or self.DEFAULT_COURSE_ID
         date_str = self._normalize_date(requested_date)
+        key = (self.db_conn, club_id, date_str, min_players)
+        
+        cached = self._TIMES_CACHE.get(key)
+        if cached and cached[0] > time.monotonic():
+            return [dict(slot) for slot in cached[1]]
         
         with self.get_connection() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT 
-                        id,
-                        time,
-                        max_players,
-                        available_slots,
-                        green_fee
-                    FROM tee_times
-                    WHERE club = %s 
-                    AND date = %s
-                    AND is_available = TRUE
-                    AND available_slots >= %s
-                    ORDER BY time ASC
-                """, (club_id, date_str, min_players))
+            # Plain tuple cursor - rows are unpacked by position (id, time,
+            # max_players, available_slots, green_fee), no per-row dict
+            with conn.cursor() as cur:
+                execute_prepared(cur, 'am_available_times', self._STATEMENTS, (club_id, date_str, min_players))
                 
                 slots = cur.fetchall()
                 
-                return [
+                result = [
                     {
-                        'tee_time_id': slot['id'],
-                        'time': slot['time'],
-                        'max_players': slot['max_players'],
-                        'available_slots': slot['available_slots'],
-                        'green_fee': float(slot['green_fee']) if slot['green_fee'] else None,
+                        'tee_time_id': tee_time_id,
+                        'time': slot_time,
+                        'max_players': max_players,
+                        'available_slots': available_slots,
+                        'green_fee': float(green_fee) if green_fee else None,
                         'date': date_str
                     }
-                    for slot in slots
+                    for tee_time_id, slot_time, max_players, available_slots, green_fee in slots
                 ]
+        
+        with self._TIMES_CACHE_LOCK:
+            if len(self._TIMES_CACHE) >= self._TIMES_CACHE_SIZE:
+                self._TIMES_CACHE.clear()
+            self._TIMES_CACHE[key] = (time.monotonic() + self._TIMES_CACHE_TTL, result)
+        
+        return [dict(slot) for slot in result]
     
     def get_daily_availability_report(
         self,
@@ -460,50 +605,56 @@ class AvailabilityManager:
         end_str = self._normalize_date(end_date)
         
         with self.get_connection() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            # Server-side cursor: long ranges stream in batches instead of being
+            # buffered whole in libpq
+            with conn.cursor(name='daily_report') as cur:
+                cur.itersize = 500
+                # Formatting and utilization are computed in SQL, so rows come back
+                # in report shape
                 cur.execute("""
                     SELECT 
-                        date,
+                        to_char(date, 'YYYY-MM-DD') as date,
+                        to_char(date, 'FMDay') as day,
                         COUNT(*) as slot_count,
-                        SUM(max_players) as total_capacity,
-                        SUM(available_slots) as total_available,
-                        SUM(max_players - available_slots) as total_booked
+                        COALESCE(SUM(max_players), 0)::int as total_capacity,
+                        COALESCE(SUM(available_slots), 0)::int as total_available,
+                        COALESCE(SUM(max_players - available_slots), 0)::int as total_booked,
+                        COALESCE(ROUND(
+                            100.0 * SUM(max_players - available_slots) / NULLIF(SUM(max_players), 0), 1
+                        ), 0)::float as utilization_pct
                     FROM tee_times
                     WHERE club = %s
                     AND date >= %s
                     AND date <= %s
-                    GROUP BY date
-                    ORDER BY date ASC
+                    GROUP BY tee_times.date
+                    ORDER BY tee_times.date ASC
                 """, (club_id, start_str, end_str))
                 
-                results = cur.fetchall()
-                
-                report = []
-                for row in results:
-                    total_capacity = row['total_capacity'] or 0
-                    total_booked = row['total_booked'] or 0
-                    utilization = (total_booked / total_capacity * 100) if total_capacity > 0 else 0
-                    
-                    date_obj = row['date']
-                    day_name = date_obj.strftime('%A') if hasattr(date_obj, 'strftime') else ''
-                    
-                    report.append({
-                        'date': self._normalize_date(row['date']),
+                return [
+                    {
+                        'date': day_date,
                         'day': day_name,
-                        'slot_count': row['slot_count'],
-                        'total_capacity': int(total_capacity),
-                        'total_available': int(row['total_available'] or 0),
-                        'total_booked': int(total_booked),
-                        'utilization_pct': round(utilization, 1)
-                    })
-                
-                return report
+                        'slot_count': slot_count,
+                        'total_capacity': total_capacity,
+                        'total_available': total_available,
+                        'total_booked': total_booked,
+                        'utilization_pct': utilization_pct
+                    }
+                    for (day_date, day_name, slot_count, total_capacity,
+                         total_available, total_booked, utilization_pct) in cur
+                ]
 
 
 # ========================================
 # DASHBOARD INTEGRATION FUNCTION
 # ========================================
 
+@lru_cache(maxsize=4)
+def _get_manager(db_url: str) -> AvailabilityManager:
+    """One AvailabilityManager per database URL, reused across status changes"""
+    return AvailabilityManager(db_url)
+
+
 def update_booking_status_with_availability(
     booking_id: str, 
     new_status: str, 
@@ -521,42 +672,39 @@ def update_booking_status_with_availability(
     - Other status changes: Just updates status
     """
     db_url = db_url or os.getenv("DATABASE_URL")
-    manager = AvailabilityManager(db_url)
+    manager = _get_manager(db_url)
     
-    # First, get current booking status
+    # One connection and one transaction for the whole status change,
+    # committed when the block exits
     with manager.get_connection() as conn:
+        # First, get current booking status
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute("SELECT status FROM bookings WHERE booking_id = %s", (booking_id,))
             result = cur.fetchone()
             current_status = result['status'] if result else None
-    
-    if not current_status:
-        return False, "Booking not found"
-    
-    # CASE 1: Moving TO Confirmed (need to reserve slot)
-    if new_status == 'Confirmed' and current_status not in SLOT_RESERVING_STATUSES:
-        return manager.confirm_booking(booking_id, updated_by)
-    
-    # CASE 2: Moving FROM Confirmed/Booked to non-reserving status (need to release slot)
-    if current_status in SLOT_RESERVING_STATUSES and new_status not in SLOT_RESERVING_STATUSES:
-        return manager.release_booking_slot(booking_id, updated_by, new_status)
-    
-    # CASE 3: Other status changes (no slot impact)
-    try:
-        with manager.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    UPDATE bookings 
-                    SET status = %s, updated_at = NOW(), updated_by = %s
-                    WHERE booking_id = %s
-                """, (new_status, updated_by, booking_id))
-                conn.commit()
         
-        return True, f"Status updated to {new_status}"
+        if not current_status:
+            return False, "Booking not found"
+        
+        # CASE 1: Moving TO Confirmed (need to reserve slot)
+        if new_status == 'Confirmed' and current_status not in SLOT_RESERVING_STATUSES:
+            return manager.confirm_booking(booking_id, updated_by, conn=conn)
         
-    except Exception as e:
-        logger.error(f"Error updating status: {e}")
-        return False, str(e)
+        # CASE 2: Moving FROM Confirmed/Booked to non-reserving status (need to release slot)
+        if current_status in SLOT_RESERVING_STATUSES and new_status not in SLOT_RESERVING_STATUSES:
+            return manager.release_booking_slot(booking_id, updated_by, new_status, conn=conn)
+        
+        # CASE 3: Other status changes (no slot impact)
+        try:
+            with conn.cursor() as cur:
+                execute_prepared(cur, 'am_set_status', manager._STATEMENTS, (new_status, updated_by, booking_id))
+            
+            return True, f"Status updated to {new_status}"
+            
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error updating status: {e}")
+            return False, str(e)
 
 
 # ========================================
@@ -31,15 +31,28 @@ def check_schema():
         conn = psycopg2.connect(DATABASE_URL)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
 
-        # Check if tee_times table exists
+        # Table existence and its columns in one query, straight from the
+        # catalogs (information_schema.columns is a stack of views over them).
+        # A missing table gives one row with table_exists false and no column.
         cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables
-                WHERE table_schema = 'public'
-                AND table_name = 'tee_times'
-            );
+            SELECT
+                r.rel IS NOT NULL AS table_exists,
+                a.attname AS column_name,
+                format_type(a.atttypid, a.atttypmod) AS data_type,
+                CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END AS is_nullable,
+                pg_get_expr(d.adbin, d.adrelid) AS column_default
+            FROM (SELECT to_regclass('public.tee_times') AS rel) r
+            LEFT JOIN pg_attribute a
+                ON a.attrelid = r.rel
+                AND a.attnum > 0
+                AND NOT a.attisdropped
+            LEFT JOIN pg_attrdef d
+                ON d.adrelid = a.attrelid
+                AND d.adnum = a.attnum
+            ORDER BY a.attnum;
         """)
-        table_exists = cursor.fetchone()['exists']
+        rows = cursor.fetchall()
+        table_exists = rows[0]['table_exists']
 
         if not table_exists:
             print("❌ TABLE 'tee_times' DOES NOT EXIST")
@@ -52,20 +65,7 @@ def check_schema():
         print("✅ Table 'tee_times' exists")
         print()
 
-        # Get column information
-        cursor.execute("""
-            SELECT
-                column_name,
-                data_type,
-                is_nullable,
-                column_default
-            FROM information_schema.columns
-            WHERE table_schema = 'public'
-            AND table_name = 'tee_times'
-            ORDER BY ordinal_position;
-        """)
-
-        columns = cursor.fetchall()
+        columns = [row for row in rows if row['column_name']]
 
         print("📊 CURRENT SCHEMA:")
         print("-" * 70)
@@ -87,6 +87,7 @@ def check_schema():
             'available_slots': 'Current available slots',
             'is_available': 'Whether slot is bookable',
             'green_fee': 'Price per player',
+            'version': 'Row version (optimistic locking)',
         }
 
         old_columns = ['day_of_week', 'tee_time', 'period']
@@ -113,6 +114,45 @@ def check_schema():
             else:
                 print(f"  ✅ {col:<20} - Correctly not present")
 
+        # Check for the lookup indexes. (club, date, time) and bookings.booking_id
+        # are already covered by their UNIQUE constraints.
+        cursor.execute("""
+            SELECT indexname
+            FROM pg_indexes
+            WHERE schemaname = 'public'
+            AND tablename = 'tee_times';
+        """)
+        index_names = {row['indexname'] for row in cursor.fetchall()}
+
+        required_indexes = {
+            'idx_tee_times_club_date': (
+                'Slots for a club and date',
+                'CREATE INDEX idx_tee_times_club_date ON tee_times(club, date);'
+            ),
+            'idx_tee_times_available_covering': (
+                'Bookable slots only (partial, covering)',
+                'CREATE INDEX CONCURRENTLY idx_tee_times_available_covering ON tee_times(club, date, time) '
+                'INCLUDE (id, max_players, available_slots, green_fee) WHERE is_available;'
+            ),
+        }
+
+        print()
+        print("📇 INDEXES:")
+        print("-" * 70)
+        missing_indexes = []
+        for name, (description, create_sql) in required_indexes.items():
+            if name in index_names:
+                print(f"  ✅ {name:<36} - {description}")
+            else:
+                print(f"  ⚠️  {name:<36} - {description} (MISSING)")
+                missing_indexes.append(create_sql)
+
+        if missing_indexes:
+            print()
+            print("   Create the missing indexes with:")
+            for create_sql in missing_indexes:
+                print(f"   {create_sql}")
+
         print()
         print("="*70)
 
@@ -48,6 +48,7 @@ CREATE TABLE tee_times (
     is_available BOOLEAN DEFAULT TRUE,     -- Whether slot is bookable
     green_fee DECIMAL(10, 2),             -- Price per player
     notes TEXT,
+    version INTEGER NOT NULL DEFAULT 0,    -- Bumped on every write (optimistic locking)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(club, date, time)
@@ -59,6 +60,9 @@ RAISE NOTICE 'Created new tee_times table with date-based schema';
 CREATE INDEX idx_tee_times_date ON tee_times(date);
 CREATE INDEX idx_tee_times_club_date ON tee_times(club, date);
 CREATE INDEX idx_tee_times_available ON tee_times(is_available, available_slots);
+CREATE INDEX idx_tee_times_available_covering ON tee_times(club, date, time)
+    INCLUDE (id, max_players, available_slots, green_fee)
+    WHERE is_available;
 
 RAISE NOTICE 'Created indexes on tee_times';
 
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Prepared Statements on Pooled Connections
+=========================================
+
+Shared by app.py and availability_manager.py. Each keeps its own
+{name: (parameter types, statement)} dict of hot-path queries and runs
+them through execute_prepared, which PREPAREs a statement the first time
+it is used on a connection so Postgres parses and plans it only once.
+
+Pools must be created with connection_factory=PooledConnection.
+"""
+
+import psycopg2
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """Pool connection that remembers which statements it has prepared"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+def execute_prepared(cur, name: str, statements: dict, params: tuple):
+    """
+    EXECUTE statements[name], PREPAREing it on this connection first if needed.
+
+    Statements are prepared one at a time, so one that can't be prepared
+    only breaks its own callers. A prepared statement outlives a rollback,
+    and a failed PREPARE isn't recorded, so the next use simply tries again.
+    """
+    prepared = cur.connection.prepared
+    if name not in prepared:
+        arg_types, statement = statements[name]
+        cur.execute(f"PREPARE {name} {arg_types} AS {statement}")
+        prepared.add(name)
+    cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
@@ -1,104 +1,355 @@
 #!/usr/bin/env python3
 """
 Test Email Parsing - Verify date and player extraction
+
+Every test email is run through app.parse_email_simple - the parser the
+webhook uses - and checked against its expected players and dates. The
+script's own parser below, which also reports which pattern matched each
+value, is held to the same expectations, so the two can't drift apart
+unnoticed. Exits non-zero if any check fails.
 """
 
+import os
 import re
+import sys
+import calendar
+import time
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import repeat
 from dateutil import parser as date_parser
 
-logging.basicConfig(level=logging.INFO, format="%(message)s")
+# app.parse_email_simple logs every step at INFO
+logging.basicConfig(level=logging.WARNING, format="%(message)s")
 
-# Copy the parse_email_simple function here for testing
-def parse_email_simple_test(subject: str, body: str):
-    """Parse email to extract dates and player count - Test version"""
-    full_text = f"{subject}\n{body}"
-    full_text_lower = full_text.lower()
-    result = {'players': 4, 'dates': []}
+# app.py sets up its database pool when imported; with no DATABASE_URL it
+# skips that, so the parser can be imported without a database
+os.environ['DATABASE_URL'] = ''
+logging.disable(logging.CRITICAL)
+import app
+logging.disable(logging.NOTSET)
+
+# The expected dates below are only inside the 2-year window for a fixed day
+TODAY = datetime(2025, 6, 1)
+
+
+class _FrozenDatetime(datetime):
+    """datetime whose now() is TODAY - stands in for app.py's clock"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(TODAY.year, TODAY.month, TODAY.day)
+
+
+app.datetime = _FrozenDatetime
+
+# Per-email reports; run with --quiet to time the parser on its own
+VERBOSE = '--quiet' not in sys.argv
+
+# Parse the emails across worker processes instead of one after another
+PARALLEL = '--parallel' in sys.argv
+
+# Patterns are compiled once here rather than looked up in re's cache per email,
+# and each set is fused into one alternation so the text is scanned once.
+# Every alternative is a lookahead, so a match never consumes text another
+# pattern needs - same approach as parse_email_simple in app.py.
+# The email is lowercased once, so the patterns are all lowercase and
+# compiled without IGNORECASE (no per-character case folding while matching).
+PLAYER_RE = re.compile(
+    r'(?<!\d)(?=(?P<np>\d+)\s*(?:players?|people|persons?|golfers?|guests?))'
+    r'|(?=(?:party|group)\s+of\s+(?P<ng>\d+))'
+    r'|(?<!\d)(?=(?P<ball>\d+)[-\s]ball)'
+    r'|(?=(?P<foursome>foursome|four\s*ball))'
+    r'|(?=(?P<twosome>twosome|two\s*ball))'
+    r'|(?=for\s+(?P<fornum>\d+))'
+    r'|(?=we\s+(?:are|have)\s+(?P<we>\d+))'
+)
+
+# (group name, fixed player count) in priority order - None = use the number matched
+PLAYER_GROUPS = [
+    ('np', None),
+    ('ng', None),
+    ('ball', None),
+    ('foursome', 4),
+    ('twosome', 2),
+    ('fornum', None),
+    ('we', None),
+]
+
+# Without a digit only foursome/twosome/four ball/two ball can match, and
+# all of those contain 'some' or 'ball' - cheap substring checks rule out
+# the PLAYER_RE scan for the many emails that can't yield a count
+_DIGIT_RE = re.compile(r'\d')
+
+# Where two formats match at the same position only the first is kept,
+# which drops the year-less duplicate of "25 December 2027".
+# The month names are factored by prefix instead of a flat 12-way alternation.
+MONTH_NAME = r'(?:j(?:an|u[nl])|feb|ma[ry]|a(?:pr|ug)|sep|oct|nov|dec)'
+
+# Numeric dates must stand alone - no digit either side - so phone numbers
+# and order IDs like "0289-12-2026-77" don't yield dates to parse
+NUMERIC_DATES = (
+    r'(?=(?<!\d)(?P<iso>\d{4}-\d{2}-\d{2})(?!\d))'
+    r'|(?=(?<!\d)(?P<dmy_full>\d{1,2}[/\-.]\d{1,2}[/\-.]\d{4})(?!\d))'
+    r'|(?=(?<!\d)(?P<dmy_short>\d{1,2}[/\-.]\d{1,2}[/\-.]\d{2})(?!\d))'
+)
+
+NAMED_DATES = (
+    r'(?=(?P<dmy_named_year>\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?' + MONTH_NAME + r'[a-z]*\s+\d{4}))'
+    r'|(?=(?P<mdy_named_year>' + MONTH_NAME + r'[a-z]*\s+\d{1,2}(?:st|nd|rd|th)?(?:\s*,\s+|\s+)\d{4}))'
+    r'|(?=(?P<dmy_named>\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?' + MONTH_NAME + r'[a-z]*))'
+    r'|(?=(?P<mdy_named>' + MONTH_NAME + r'[a-z]*\s+\d{1,2}(?:st|nd|rd|th)?))'
+)
+
+# Every date starts with a digit or a month's first letter, so the leading
+# class rejects most positions before any alternative is tried
+DATE_RE = re.compile(r'(?=[\dadfjmnos])(?:' + NUMERIC_DATES + '|' + NAMED_DATES + ')')
+
+# Prefilter: with no month name anywhere the named formats can't match, so
+# the email is scanned with the numeric formats alone
+MONTH_RE = re.compile(MONTH_NAME)
+NUMERIC_DATE_RE = re.compile(r'(?=\d)(?:' + NUMERIC_DATES + ')')
+
+DATE_SEP_RE = re.compile(r'[/\-.]')
+
+# Month names as dateutil recognises them
+MONTHS = {
+    name: number
+    for number, names in enumerate([
+        ('jan', 'january'), ('feb', 'february'), ('mar', 'march'), ('apr', 'april'),
+        ('may',), ('jun', 'june'), ('jul', 'july'), ('aug', 'august'),
+        ('sep', 'sept', 'september'), ('oct', 'october'), ('nov', 'november'), ('dec', 'december'),
+    ], 1)
+    for name in names
+}
+
+
+def is_valid_date(year: int, month: int, day: int) -> bool:
+    """Whether datetime(year, month, day) would succeed - checked, not caught"""
+    return 1 <= year <= 9999 and 1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1]
+
+
+def parse_iso_date(date_str: str):
+    """Parse a regex-matched YYYY-MM-DD string, or None if it isn't a real date"""
+    year, month, day = int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10])
+    if not is_valid_date(year, month, day):
+        return None
+    return datetime(year, month, day)
+
+
+def parse_numeric_date(date_str: str):
+    """Parse a regex-matched DD/MM/YYYY or DD/MM/YY string without dateutil.
+
+    Returns None where dateutil would fail: an impossible date, or '.'
+    mixed with '/' or '-'.
+    """
+    day_str, month_str, year_str = DATE_SEP_RE.split(date_str)
+    separators = {date_str[len(day_str)], date_str[len(day_str) + len(month_str) + 1]}
+    if len(separators) > 1 and '.' in separators:
+        return None
+    day, month, year = int(day_str), int(month_str), int(year_str)
+    if year < 100:
+        year += 2000
+    if month > 12 and day <= 12:
+        # Not valid day-first - read month-first, as dateutil does
+        day, month = month, day
+    if not is_valid_date(year, month, day):
+        return None
+    return datetime(year, month, day)
+
+
+def parse_named_date(date_str: str, default_year: int):
+    """Parse '25th December 2025' / 'Dec 25, 2025' / '3rd of March' without dateutil.
+
+    Returns None if a word is not a month name dateutil would recognise,
+    and False if the month is known but the day doesn't exist in it.
+    """
+    day = month = year = None
+    for token in date_str.lower().replace(',', ' ').split():
+        if token[0].isdigit():
+            digits = token.rstrip('stndrh')
+            if len(digits) == 4:
+                year = int(digits)
+            else:
+                day = int(digits)
+        elif token != 'of':
+            month = MONTHS.get(token)
+            if month is None:
+                return None
+    if day is None or month is None:
+        return None
+    year = year or default_year
+    if not is_valid_date(year, month, day):
+        return False
+    return datetime(year, month, day)
+
+
+@lru_cache(maxsize=4096)
+def parse_date_cached(date_str: str, dayfirst: bool, default: datetime) -> datetime:
+    """dateutil parse, memoized - the same date strings recur within and across emails"""
+    return date_parser.parse(date_str, fuzzy=True, dayfirst=dayfirst, default=default)
 
-    print(f"\n{'='*70}")
-    print(f"🔍 PARSING EMAIL")
-    print(f"{'='*70}")
-    print(f"Subject: {subject}")
-    print(f"Body: {body[:150]}...")
-    print()
+
+def parse_email_core(subject: str, body: str, today=None):
+    """
+    Parse email to extract dates and player count - no printing.
+
+    'today' (a date) sets the window dates must fall in; defaults to now.
+
+    Besides 'players' and 'dates' the result records what matched, for
+    print_report: 'player_pattern' (None = default used) and 'date_events',
+    (formatted date or None, matched text, pattern name, error or None)
+    for each new valid date or failed parse.
+    """
+    players, dates, player_pattern, date_events = parse_email_cached(subject, body, today or datetime.now().date())
+    return {
+        'players': players,
+        'dates': list(dates),
+        'player_pattern': player_pattern,
+        'date_events': list(date_events),
+    }
+
+
+@lru_cache(maxsize=1024)
+def parse_email_cached(subject: str, body: str, today) -> tuple:
+    """
+    parse_email_core's work, memoized for re-polled emails.
+
+    Keyed on the day too, since which dates count as valid depends on it.
+    Returns (players, dates, player_pattern, date_events) as tuples.
+    """
+    full_text_lower = f"{subject}\n{body}".lower()
+    result = {'players': 4, 'dates': [], 'player_pattern': None, 'date_events': []}
 
     # Extract player count
-    player_patterns = [
-        r'(\d+)\s*(?:players?|people|persons?|golfers?|guests?)',
-        r'(?:party|group)\s+of\s+(\d+)',
-        r'(\d+)[-\s]ball',
-        r'(?:foursome|four\s*ball)',
-        r'(?:twosome|two\s*ball)',
-        r'for\s+(\d+)',
-        r'we\s+(?:are|have)\s+(\d+)',
-    ]
-
-    player_found = False
-    for pattern in player_patterns:
-        match = re.search(pattern, full_text_lower)
+    first_hits = {}
+    if _DIGIT_RE.search(full_text_lower) or 'some' in full_text_lower or 'ball' in full_text_lower:
+        for match in PLAYER_RE.finditer(full_text_lower):
+            first_hits.setdefault(match.lastgroup, match)
+
+    for group, count in PLAYER_GROUPS:
+        match = first_hits.get(group)
         if match:
-            if pattern in [r'(?:foursome|four\s*ball)', r'(?:twosome|two\s*ball)']:
-                num = 4 if 'four' in pattern else 2
-            else:
-                num = int(match.group(1))
+            num = count if count is not None else int(match.group(group))
 
             if 1 <= num <= 20:
                 result['players'] = num
-                player_found = True
-                print(f"✅ PLAYERS: {num} (matched: '{pattern[:40]}')")
+                result['player_pattern'] = group
                 break
 
-    if not player_found:
-        print(f"ℹ️  PLAYERS: 4 (default)")
-
     # Extract dates
-    date_patterns = [
-        (r'(\d{4}-\d{2}-\d{2})', 'iso'),
-        (r'(\d{1,2}[/\-.]\d{1,2}[/\-.]\d{4})', 'dmy_full'),
-        (r'(\d{1,2}[/\-.]\d{1,2}[/\-.]\d{2})(?!\d)', 'dmy_short'),
-        (r'(\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{4})', 'dmy_named_year'),
-        (r'((?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2}(?:st|nd|rd|th)?\s*,?\s+\d{4})', 'mdy_named_year'),
-        (r'(\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*)', 'dmy_named'),
-        (r'((?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2}(?:st|nd|rd|th)?)', 'mdy_named'),
-    ]
-
-    dates_found = []
-    print()
-    for pattern, pattern_name in date_patterns:
-        for match in re.finditer(pattern, full_text_lower, re.IGNORECASE):
-            date_str = match.group(1).strip()
-
-            try:
-                if pattern_name == 'iso':
-                    parsed_date = datetime.strptime(date_str, '%Y-%m-%d')
-                elif pattern_name.startswith('dmy'):
-                    parsed_date = date_parser.parse(date_str, fuzzy=True, dayfirst=True, default=datetime.now().replace(day=1))
-                elif pattern_name.startswith('mdy'):
-                    parsed_date = date_parser.parse(date_str, fuzzy=True, dayfirst=False, default=datetime.now().replace(day=1))
-                else:
-                    parsed_date = date_parser.parse(date_str, fuzzy=True, dayfirst=True, default=datetime.now().replace(day=1))
-
-                today = datetime.now().date()
-                two_years_ahead = today.replace(year=today.year + 2)
-
-                if parsed_date.date() >= today and parsed_date.date() <= two_years_ahead:
-                    formatted = parsed_date.strftime('%Y-%m-%d')
-                    if formatted not in dates_found:
-                        dates_found.append(formatted)
-                        print(f"✅ DATE: {formatted} <- '{date_str}' ({pattern_name})")
-
-            except Exception as e:
-                print(f"❌ FAILED: '{date_str}' ({pattern_name}): {e}")
-                continue
+    dates_found = set()
+    date_events = result['date_events']
+    # Validation window and parse defaults
+    try:
+        two_years_ahead = today.replace(year=today.year + 2)
+    except ValueError:
+        # 29 February
+        two_years_ahead = today.replace(year=today.year + 2, day=28)
+    # Midnight on the 1st, so the parse cache key stays the same all month
+    default_month_start = datetime(today.year, today.month, 1)
+    last_end = {}
+    # End of the text already claimed by a parsed date. Matches arrive in start
+    # order, so one ending by here lies inside a parsed date, e.g. "january 20"
+    # in "1st january 2026" or "26-01-28" in "2026-01-28", and is skipped.
+    # Matches that run past it are kept: "11 december" in "2311 December 25th
+    # 2025" must not hide the full date.
+    consumed_end = 0
+    date_re = DATE_RE if MONTH_RE.search(full_text_lower) else NUMERIC_DATE_RE
+    for match in date_re.finditer(full_text_lower):
+        pattern_name = match.lastgroup
+        start, end = match.span(pattern_name)
+        if end <= consumed_end:
+            continue
+        if start < last_end.get(pattern_name, 0):
+            # Tail of this format's previous match, e.g. "5/12/2026" in "25/12/2026"
+            continue
+        last_end[pattern_name] = end
+
+        date_str = match.group(pattern_name).strip()
+
+        # Year check on the matched digits before any parsing - a date whose
+        # year is outside the window can never be valid. It still claims its
+        # text, so "january 20" inside "1st january 2020" isn't tried next.
+        if pattern_name == 'iso':
+            year = int(date_str[:4])
+        elif pattern_name == 'dmy_short':
+            year = 2000 + int(date_str[-2:])
+        elif pattern_name in ('dmy_full', 'dmy_named_year', 'mdy_named_year'):
+            year = int(date_str[-4:])
+        else:
+            year = None
+        if year is not None and not today.year <= year <= two_years_ahead.year:
+            consumed_end = end
+            continue
+
+        # The regex has fixed each format's layout, so the fast parsers check
+        # the numbers instead of raising; only the dateutil fallback can throw
+        if pattern_name == 'iso':
+            parsed_date = parse_iso_date(date_str)
+        elif pattern_name in ('dmy_full', 'dmy_short'):
+            # Numeric layout is fixed by the regex - no dateutil needed
+            parsed_date = parse_numeric_date(date_str)
+        else:
+            # Month name formats - only odd month words fall back to dateutil
+            parsed_date = parse_named_date(date_str, default_month_start.year)
+            if parsed_date is None:
+                try:
+                    parsed_date = parse_date_cached(date_str, pattern_name.startswith('dmy'), default_month_start)
+                except Exception as e:
+                    date_events.append((None, date_str, pattern_name, e))
+                    continue
+
+        if not parsed_date:
+            date_events.append((None, date_str, pattern_name, "not a valid date"))
+            continue
+
+        consumed_end = end
+
+        if today <= parsed_date.date() <= two_years_ahead:
+            formatted = parsed_date.strftime('%Y-%m-%d')
+            if formatted not in dates_found:
+                dates_found.add(formatted)
+                date_events.append((formatted, date_str, pattern_name, None))
 
     result['dates'] = sorted(dates_found)
+    return result['players'], tuple(result['dates']), result['player_pattern'], tuple(date_events)
+
+
+def print_report(subject: str, body: str, result: dict):
+    """Print what parse_email_core found for one email"""
+    print(f"\n{'='*70}")
+    print(f"🔍 PARSING EMAIL")
+    print(f"{'='*70}")
+    print(f"Subject: {subject}")
+    print(f"Body: {body[:150]}...")
+    print()
+
+    if result['player_pattern']:
+        print(f"✅ PLAYERS: {result['players']} (matched: '{result['player_pattern']}')")
+    else:
+        print(f"ℹ️  PLAYERS: 4 (default)")
+
+    print()
+    for formatted, date_str, pattern_name, error in result['date_events']:
+        if error is None:
+            print(f"✅ DATE: {formatted} <- '{date_str}' ({pattern_name})")
+        else:
+            print(f"❌ FAILED: '{date_str}' ({pattern_name}): {error}")
 
     print()
     print(f"{'='*70}")
     print(f"📊 RESULT: {result['players']} players, {len(result['dates'])} date(s)")
     print(f"{'='*70}")
+
+
+def parse_email_simple_test(subject: str, body: str):
+    """Parse email to extract dates and player count - Test version"""
+    result = parse_email_core(subject, body)
+    if VERBOSE:
+        print_report(subject, body, result)
     return result
 
 
@@ -107,67 +358,121 @@ test_emails = [
     {
         "name": "UK Date Format with Players",
         "subject": "Tee Time Inquiry",
-        "body": "Hi, we have 4 players and would like to book on 25/12/2025"
+        "body": "Hi, we have 4 players and would like to book on 25/12/2025",
+        "players": 4,
+        "dates": ["2025-12-25"],
     },
     {
         "name": "US Date Format",
         "subject": "Booking Request",
-        "body": "I need a tee time for 6 people on 12/25/2025"
+        "body": "I need a tee time for 6 people on 12/25/2025",
+        "players": 6,
+        "dates": ["2025-12-25"],
     },
     {
         "name": "Natural Language Date",
         "subject": "Tee time",
-        "body": "Can we book for December 25th 2025? Party of 8 golfers."
+        "body": "Can we book for December 25th 2025? Party of 8 golfers.",
+        "players": 8,
+        "dates": ["2025-12-25"],
     },
     {
         "name": "Multiple Dates",
         "subject": "Availability check",
-        "body": "Looking for availability on 1st January 2026 or 2nd January 2026 for 4 players"
+        "body": "Looking for availability on 1st January 2026 or 2nd January 2026 for 4 players",
+        "players": 4,
+        "dates": ["2026-01-01", "2026-01-02"],
     },
     {
         "name": "Foursome (4-ball)",
         "subject": "Booking",
-        "body": "We'd like to book a foursome on Jan 15 2026"
+        "body": "We'd like to book a foursome on Jan 15 2026",
+        "players": 4,
+        "dates": ["2026-01-15"],
     },
     {
         "name": "ISO Format",
         "subject": "Request",
-        "body": "Booking for 2 people on 2026-01-20"
+        "body": "Booking for 2 people on 2026-01-20",
+        "players": 2,
+        "dates": ["2026-01-20"],
     },
     {
         "name": "Tricky Format",
         "subject": "Enquiry",
-        "body": "We are 6 and want to play on the 3rd of March 2026"
+        "body": "We are 6 and want to play on the 3rd of March 2026",
+        "players": 6,
+        "dates": ["2026-03-03"],
     },
     {
         "name": "Short Year Format",
         "subject": "Booking",
-        "body": "Group of 5 players for 15/03/26"
+        "body": "Group of 5 players for 15/03/26",
+        "players": 5,
+        "dates": ["2026-03-15"],
     },
     {
         "name": "Mixed Format",
         "subject": "Tee Times",
-        "body": "Booking for 4 on April 21st, 2026 or 22/04/2026"
+        "body": "Booking for 4 on April 21st, 2026 or 22/04/2026",
+        "players": 4,
+        "dates": ["2026-04-21", "2026-04-22"],
     },
 ]
 
 if __name__ == "__main__":
+    # Block-buffer stdout - the reports are written in one go at the end
+    sys.stdout.reconfigure(line_buffering=False)
+
     print("\n" + "="*70)
     print("EMAIL PARSING TEST SUITE")
     print("="*70)
 
-    for i, test in enumerate(test_emails, 1):
-        print(f"\n\n📧 TEST {i}: {test['name']}")
-        result = parse_email_simple_test(test['subject'], test['body'])
+    # Parse everything first, so the timing covers only the parser (and, with
+    # --parallel, the worker pool - which dominates for a batch this small)
+    start = time.perf_counter()
+    if PARALLEL:
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(
+                parse_email_core,
+                [test['subject'] for test in test_emails],
+                [test['body'] for test in test_emails],
+                repeat(TODAY.date()),
+            ))
+    else:
+        results = [parse_email_core(test['subject'], test['body'], TODAY.date()) for test in test_emails]
+    elapsed = time.perf_counter() - start
 
-        print(f"\n   PARSED: {result['players']} players")
-        if result['dates']:
-            print(f"   DATES:")
-            for date in result['dates']:
-                print(f"      - {date}")
-        else:
-            print(f"   DATES: None found")
+    if VERBOSE:
+        for i, (test, result) in enumerate(zip(test_emails, results), 1):
+            print(f"\n\n📧 TEST {i}: {test['name']}")
+            print_report(test['subject'], test['body'], result)
+
+            print(f"\n   PARSED: {result['players']} players")
+            if result['dates']:
+                print(f"   DATES:")
+                for date in result['dates']:
+                    print(f"      - {date}")
+            else:
+                print(f"   DATES: None found")
+
+    # Both parsers must give each email's expected players and dates
+    failures = []
+    for test, result in zip(test_emails, results):
+        expected = (test['players'], test['dates'])
+        production = app.parse_email_simple(test['subject'], test['body'])
+        for parser_name, parsed in (('app.parse_email_simple', production), ('test parser', result)):
+            if (parsed['players'], parsed['dates']) != expected:
+                failures.append(f"{test['name']} - {parser_name}: got {parsed['players']} players, "
+                                f"{parsed['dates']}; expected {expected[0]} players, {expected[1]}")
 
     print("\n\n" + "="*70)
-    print("✅ TEST SUITE COMPLETE")
+    print(f"✅ TEST SUITE COMPLETE - {len(test_emails)} emails parsed in {elapsed * 1000:.2f} ms")
+    if failures:
+        print(f"❌ {len(failures)} CHECK(S) FAILED:")
+        for failure in failures:
+            print(f"   - {failure}")
+    else:
+        print(f"✅ ALL CHECKS PASSED - app.parse_email_simple and the test parser agree")
     print("="*70)
+    sys.exit(1 if failures else 0)